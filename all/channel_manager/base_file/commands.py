@@ -99,7 +99,7 @@ class MyBrandNewChannelRun(DevelopmentVersionBaseCommand):
 
     def run(self, command):
         sublime.active_window().run_command( "show_panel", {"panel": "console", "toggle": False} )
-        submodules_manager.main( command )
+        submodules_manager.main( command, g_channelSettings )
 
 
 class MyBrandNewChannelGenerateChannelFile(DevelopmentVersionBaseCommand):
@@ -121,7 +121,7 @@ class MyBrandNewChannelRunChannelAndSubmodules(DevelopmentVersionBaseCommand):
 
         if load_channel_settings():
             channel_manager.main( g_channelSettings, command )
-            submodules_manager.main( command )
+            submodules_manager.main( command, g_channelSettings )
 
         else:
             log( 1, "Error: Could not load the settings files! g_channelSettings:", str( g_channelSettings ) )
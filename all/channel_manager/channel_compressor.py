@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Compressor, write the channel files compressed copies and their manifest
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import io
+import json
+import gzip
+import hashlib
+import threading
+
+from collections import OrderedDict
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from .channel_writer import write_json_file
+    from .channel_writer import atomic_file_writer
+
+except( ImportError, ValueError ):
+    from channel_writer import write_json_file
+    from channel_writer import atomic_file_writer
+
+
+# The brotli module is not shipped with Python, then the `.br` files are only written when it is installed
+try:
+    import brotli
+
+except ImportError:
+    brotli = None
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# Only one thread compresses the channel files at a time, as the next generation can finish before
+# the last compression
+g_compression_lock = threading.Lock()
+
+
+def gzip_compress(data):
+    """
+        The gzip header has no file name and modification time, then the same data is always
+        compressed to the same bytes.
+    """
+    output_file = io.BytesIO()
+
+    with gzip.GzipFile( fileobj=output_file, mode='wb', compresslevel=9, mtime=0 ) as gzip_file:
+        gzip_file.write( data )
+
+    return output_file.getvalue()
+
+
+def brotli_compress(data):
+    return brotli.compress( data, quality=11 )
+
+
+def get_compressors():
+    """
+        @return an OrderedDict with the file extension and compressor function for each encoding
+    """
+    compressors = OrderedDict()
+    compressors['gzip'] = ( ".gz", gzip_compress )
+
+    if brotli is not None:
+        compressors['br'] = ( ".br", brotli_compress )
+
+    return compressors
+
+
+def compress_channel_files_async(files_paths, manifest_path):
+    """
+        Call compress_channel_files() on a new thread, then the channel generation is finished without
+        waiting for the compression.
+
+        @return the started thread
+    """
+    thread = threading.Thread( target=compress_channel_files, args=( files_paths, manifest_path ) )
+    thread.start()
+
+    return thread
+
+
+def compress_channel_files(files_paths, manifest_path):
+    """
+        Write a copy of each file compressed with each available encoding, as `channel.json.gz`, at
+        the maximum compression level. Their sizes and sha256 digests are saved on the `manifest_path`,
+        whose files names are relative to its directory. The files which did not change since the
+        last manifest are not compressed again.
+
+        @return the manifest OrderedDict, or None when it could not be written
+    """
+
+    with g_compression_lock:
+
+        try:
+            return _compress_channel_files( files_paths, manifest_path )
+
+        except Exception as error:
+            log.exception( "Error: Could not compress the channel files %s: %s", files_paths, error )
+
+    return None
+
+
+def _compress_channel_files(files_paths, manifest_path):
+    manifest_directory = os.path.dirname( manifest_path )
+    compressors = get_compressors()
+
+    last_manifest = load_manifest_file( manifest_path )
+    last_files = last_manifest.get( 'files', {} )
+
+    manifest_files = OrderedDict()
+
+    for file_path in files_paths:
+        file_name = os.path.relpath( file_path, manifest_directory ).replace( os.sep, "/" )
+
+        with open( file_path, 'rb' ) as input_file:
+            data = input_file.read()
+
+        file_entry = OrderedDict()
+        file_entry['size'] = len( data )
+        file_entry['sha256'] = hashlib.sha256( data ).hexdigest()
+
+        last_entry = last_files.get( file_name, {} )
+
+        for encoding, ( extension, compress ) in compressors.items():
+            compressed_path = file_path + extension
+            last_compressed_entry = last_entry.get( encoding )
+
+            if last_entry.get( 'sha256' ) == file_entry['sha256'] and last_compressed_entry \
+                    and get_file_size( compressed_path ) == last_compressed_entry['size']:
+                file_entry[encoding] = last_compressed_entry
+                continue
+
+            compressed_data = compress( data )
+
+            with atomic_file_writer( compressed_path, 'wb' ) as output_file:
+                output_file.write( compressed_data )
+
+            compressed_entry = OrderedDict()
+            compressed_entry['file'] = file_name + extension
+            compressed_entry['size'] = len( compressed_data )
+            compressed_entry['sha256'] = hashlib.sha256( compressed_data ).hexdigest()
+
+            file_entry[encoding] = compressed_entry
+            log( 1, "Compressed the file `%s` with %s from %d to %d bytes.", file_name, encoding, len( data ), len( compressed_data ) )
+
+        manifest_files[file_name] = file_entry
+
+    remove_stale_compressed_files( manifest_directory, last_files, manifest_files )
+
+    manifest = OrderedDict()
+    manifest['files'] = manifest_files
+
+    write_json_file( manifest_path, manifest )
+    return manifest
+
+
+def remove_stale_compressed_files(manifest_directory, last_files, manifest_files):
+    """
+        Remove the compressed copies of the files which are not on the manifest anymore.
+    """
+
+    for file_name, last_entry in last_files.items():
+
+        if file_name in manifest_files:
+            continue
+
+        for encoding, compressed_entry in last_entry.items():
+
+            if not isinstance( compressed_entry, dict ) or 'file' not in compressed_entry:
+                continue
+
+            compressed_path = os.path.join( manifest_directory, os.path.normpath( compressed_entry['file'] ) )
+
+            if os.path.exists( compressed_path ):
+                log( 1, "Removing the stale compressed file: %s", compressed_path )
+                os.remove( compressed_path )
+
+
+def load_manifest_file(manifest_path):
+
+    try:
+        with io.open( manifest_path, 'r', encoding='utf-8' ) as manifest_file:
+            return json.load( manifest_file )
+
+    except ( IOError, OSError, ValueError ):
+        return {}
+
+
+def get_file_size(file_path):
+
+    try:
+        return os.path.getsize( file_path )
+
+    except OSError:
+        return None
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Channel Delta, the packages entries changed between two channel generations
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import json
+
+from collections import OrderedDict
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from .channel_writer import JSON_FORMAT
+
+except( ImportError, ValueError ):
+    from channel_writer import JSON_FORMAT
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# Increment this when the delta format change, then the old clients do not apply it
+CHANNEL_DELTA_VERSION = 1
+
+
+def create_channel_delta(last_entries, repositories, dependencies, base_digests, digests):
+    """
+        The delta has the entries added, modified and removed since the last generated files, keyed
+        by their names. The dependencies are the entries with `load_order`. It is applied by the
+        function `channel_utilities.apply_channel_delta()`.
+
+        @param last_entries a dictionary with the last generated entries of each name, as returned
+                            by the function `load_repository_file()`
+        @param repositories an `EncodedList` with the new packages entries
+        @param dependencies an `EncodedList` with the new dependencies entries
+        @param base_digests a dictionary with the last channel files names and their sha256 digests
+        @param digests      a dictionary with the new channel files names and their sha256 digests
+    """
+    added    = OrderedDict()
+    modified = OrderedDict()
+    names    = set()
+
+    for encoded_list in ( repositories, dependencies ):
+
+        for entry, fragment in zip( encoded_list.entries, encoded_list.fragments ):
+            name = entry['name']
+            last_entry = last_entries.get( name )
+
+            names.add( name )
+
+            if last_entry is None:
+                added[name] = entry
+
+            # The entries are compared as they are written on the files
+            elif json.dumps( last_entry, **JSON_FORMAT ) != fragment:
+                modified[name] = entry
+
+    channel_delta = OrderedDict()
+    channel_delta['delta_version'] = CHANNEL_DELTA_VERSION
+
+    channel_delta['base_digests'] = base_digests
+    channel_delta['digests']      = digests
+
+    channel_delta['added']    = added
+    channel_delta['modified'] = modified
+    channel_delta['removed']  = sorted( name for name in last_entries if name not in names )
+
+    log( 1, "The channel delta has %d added, %d modified and %d removed entries.", len( added ), len( modified ),
+            len( channel_delta['removed'] ) )
+
+    return channel_delta
@@ -88,6 +88,7 @@ from .channel_utilities import get_installed_packages
 from .channel_utilities import InstallationCancelled
 from .channel_utilities import NoPackagesAvailable
 from .channel_utilities import load_repository_file
+from .channel_utilities import close_repository_file
 from .channel_utilities import is_channel_upgraded
 from .channel_utilities import print_failed_repositories
 from .channel_utilities import is_dependency
@@ -501,37 +502,43 @@ class ChannelInstaller(threading.Thread):
         repositories_loaded = load_repository_file( self.channelSettings['CHANNEL_REPOSITORY_FILE'], {} )
         log( _grade(), "get_stable_packages, packages_tonot_install: " + str( packages_tonot_install ) )
 
-        if is_exclusively_install:
-            log( _grade(), "Performing exclusively installation of the packages: " + str( install_exclusively ) )
+        # The `RepositoryIndex` keeps its file opened until it is closed
+        try:
 
-            for package_name in repositories_loaded:
+            if is_exclusively_install:
+                log( _grade(), "Performing exclusively installation of the packages: " + str( install_exclusively ) )
 
-                if package_name in install_exclusively:
-                    packages_to_install[package_name] = repositories_loaded[package_name]
+                for package_name in repositories_loaded:
 
-        else:
-            packages_to_install = repositories_loaded
+                    if package_name in install_exclusively:
+                        packages_to_install[package_name] = repositories_loaded[package_name]
 
-        log( 2, "get_stable_packages, packages_to_install: %s" % [name for name in packages_to_install] )
-        for package_name in packages_to_install:
+            else:
+                packages_to_install = repositories_loaded
 
-            # # For quick testing
-            # current_index += 1
-            # if current_index > 7:
-            #     break
+            log( 2, "get_stable_packages, packages_to_install: %s" % [name for name in packages_to_install] )
+            for package_name in packages_to_install:
 
-            if package_name not in packages_tonot_install \
-                    and not is_dependency( package_name, packages_to_install ):
+                # # For quick testing
+                # current_index += 1
+                # if current_index > 7:
+                #     break
 
-                filtered_packages.append( package_name )
+                if package_name not in packages_tonot_install \
+                        and not is_dependency( package_name, packages_to_install ):
 
-            # When installing the channel, we must mark the packages already installed as packages which
-            # where not installed, so they are not uninstalled when the channel is uninstalled.
-            if not self.isUpdateInstallation \
-                    and package_name in installed_packages \
-                    and package_name not in g_packages_not_installed:
+                    filtered_packages.append( package_name )
 
-                g_packages_not_installed.append( package_name )
+                # When installing the channel, we must mark the packages already installed as packages which
+                # where not installed, so they are not uninstalled when the channel is uninstalled.
+                if not self.isUpdateInstallation \
+                        and package_name in installed_packages \
+                        and package_name not in g_packages_not_installed:
+
+                    g_packages_not_installed.append( package_name )
+
+        finally:
+            close_repository_file( repositories_loaded )
 
         # return \
         # [
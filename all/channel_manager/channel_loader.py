@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Loader, load only the required packages from the default channel
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import re
+import json
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+JSON_WHITESPACE_REGEX = re.compile( r'[ \t\n\r]*' )
+
+# The default values set by the Package Control `ChannelProvider.get_packages()`
+PACKAGE_DEFAULT_VALUES = (
+    ( 'buy', None ),
+    ( 'issues', None ),
+    ( 'labels', [] ),
+    ( 'previous_names', [] ),
+    ( 'readme', None ),
+    ( 'donate', None ),
+)
+
+g_json_decoder = json.JSONDecoder()
+
+
+def load_channel_packages(channel_contents, wanted_names, update_url=None):
+    """
+        Load the packages of a Package Control channel file, as the `ChannelProvider.get_sources()`
+        and `ChannelProvider.get_packages()` do for each repository, but only the `wanted_names`
+        packages are kept. The channel file is decoded one package at a time, instead of holding all
+        the packages of all repositories in memory.
+
+        @param channel_contents the channel file contents
+        @param wanted_names     a set with the packages names to load, or None to load all
+        @param update_url       None, or a function to fix the out-dated repositories URLs
+
+        @return a dictionary with the packages names and information
+    """
+    channel_information = parse_channel_file( channel_contents, wanted_names )
+    schema_version = channel_information.get( 'schema_version' )
+
+    # The old schema versions have the packages on the `packages` key with another format
+    if not schema_version or int( str( schema_version ).split( '.' )[0] ) < 2:
+        raise ValueError( "Unsupported channel schema version `%s`." % schema_version )
+
+    packages_cache = {}
+    update_url = update_url or ( lambda url: url )
+
+    for repository_url, packages in channel_information.get( 'packages_cache', {} ).items():
+        packages_cache[update_url( repository_url )] = packages
+
+    all_packages = {}
+
+    for repository_url in channel_information.get( 'repositories', [] ):
+
+        for package in packages_cache.get( update_url( repository_url ), [] ):
+            package = normalize_channel_package( package )
+            all_packages[package['name']] = package
+
+    return all_packages
+
+
+def normalize_channel_package(package):
+    """
+        Set the same values the `ChannelProvider.get_packages()` sets for the schema version 2.0
+        and later.
+    """
+    package = package.copy()
+    last_modified = None
+
+    for release in package.get( 'releases', [] ):
+        date = release.get( 'date' )
+
+        if not last_modified or ( date and date > last_modified ):
+            last_modified = date
+
+    package['last_modified'] = last_modified
+
+    for field, value in PACKAGE_DEFAULT_VALUES:
+
+        if field not in package:
+            package[field] = value
+
+    return package
+
+
+def parse_channel_file(channel_contents, wanted_names):
+    """
+        Walk the channel file top level object, only keeping the `schema_version`, `repositories`
+        and the `packages_cache` packages which are on `wanted_names`, or all of them when it is None.
+
+        @return a dictionary with the channel keys `schema_version`, `repositories` and
+                `packages_cache`, which has only the wanted packages
+    """
+    channel_information = {}
+
+    def parse_channel_value(key, index):
+
+        if key == 'packages_cache':
+            channel_information[key] = {}
+
+            def parse_repository(repository_url, index):
+                packages = channel_information[key][repository_url] = []
+                return _parse_array( channel_contents, index, lambda index: parse_package( packages, index ) )
+
+            return _parse_object( channel_contents, index, parse_repository )
+
+        if key in ( 'schema_version', 'repositories' ):
+            channel_information[key], index = g_json_decoder.raw_decode( channel_contents, index )
+            return index
+
+        return skip_json_value( channel_contents, index )
+
+    def parse_package(packages, index):
+        package, index = g_json_decoder.raw_decode( channel_contents, index )
+
+        # Only one package object is alive at a time, unless it is wanted
+        if isinstance( package, dict ) and ( wanted_names is None or package.get( 'name' ) in wanted_names ):
+            packages.append( package )
+
+        return index
+
+    _parse_object( channel_contents, _skip_whitespace( channel_contents, 0 ), parse_channel_value )
+    return channel_information
+
+
+def _parse_object(channel_contents, index, parse_value):
+    """
+        @param parse_value a function `(key, value_index)` returning the position after the value
+        @return the position after the object end
+    """
+    index = _skip_whitespace( channel_contents, _expect( channel_contents, index, "{" ) )
+
+    if channel_contents[index:index + 1] == "}":
+        return index + 1
+
+    while True:
+        key, index = g_json_decoder.raw_decode( channel_contents, index )
+        index = _expect( channel_contents, index, ":" )
+
+        index = parse_value( key, _skip_whitespace( channel_contents, index ) )
+        index = _skip_whitespace( channel_contents, index )
+
+        if channel_contents[index:index + 1] == "}":
+            return index + 1
+
+        index = _skip_whitespace( channel_contents, _expect( channel_contents, index, "," ) )
+
+
+def _parse_array(channel_contents, index, parse_value):
+    """
+        @param parse_value a function `(value_index)` returning the position after the value
+        @return the position after the array end
+    """
+    index = _skip_whitespace( channel_contents, _expect( channel_contents, index, "[" ) )
+
+    if channel_contents[index:index + 1] == "]":
+        return index + 1
+
+    while True:
+        index = _skip_whitespace( channel_contents, parse_value( index ) )
+
+        if channel_contents[index:index + 1] == "]":
+            return index + 1
+
+        index = _skip_whitespace( channel_contents, _expect( channel_contents, index, "," ) )
+
+
+def skip_json_value(channel_contents, index):
+    """
+        @return the position after the json value starting on `index`, which is discarded
+    """
+    return g_json_decoder.raw_decode( channel_contents, index )[1]
+
+
+def _skip_whitespace(channel_contents, index):
+    return JSON_WHITESPACE_REGEX.match( channel_contents, index ).end()
+
+
+def _expect(channel_contents, index, character):
+    """
+        @return the position after the `character`, which must be the next non whitespace character
+    """
+    index = _skip_whitespace( channel_contents, index )
+
+    if channel_contents[index:index + 1] != character:
+        raise ValueError( "Expected `%s` at the position %s, but found `%s`." % ( character, index, channel_contents[index:index + 20] ) )
+
+    return index + 1
+
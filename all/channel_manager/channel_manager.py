@@ -39,8 +39,10 @@ import threading
 
 import re
 import shlex
+import hashlib
 import configparser
 import contextlib
+import concurrent.futures
 
 from collections import OrderedDict
 from distutils.version import LooseVersion
@@ -48,14 +50,75 @@ from distutils.version import LooseVersion
 from . import settings as g_settings
 g_is_already_running = False
 g_failed_repositories = []
+g_failed_repositories_lock = threading.Lock()
+g_thread_local_storage     = threading.local()
+
+g_git_tags_tables      = {}
+g_git_tags_tables_lock = threading.Lock()
 
 from .channel_utilities import load_repository_file
 
+from .channel_loader import load_channel_packages
+from .channel_snapshot import ChannelSnapshot
+from .channel_snapshot import get_proxies
+
+from .channel_writer import EncodedList
+from .channel_writer import write_json_file
+from .channel_writer import get_file_digest
+
+from .channel_delta import create_channel_delta
+
+from .repository_shards import write_sharded_repository_file
+
+from .channel_compressor import compress_channel_files_async
+
+from .channel_views import write_build_views
+
+from .repository_index import write_repository_index
+
+from .git_metadata import GIT_TAGS_COMMAND
+from .git_metadata import read_git_tags_table
+from .git_metadata import read_git_tags_table_from_files
+from .git_metadata import read_binary_file
+from .git_metadata import read_git_references
+from .git_metadata import resolve_git_reference
+from .git_metadata import get_git_cache_references
+from .git_metadata import get_git_references_fingerprint
+
+from .git_metadata_cache import get_git_metadata_cache
+from .git_metadata_cache import get_opened_git_metadata_cache
+
+from .git_object_server import get_git_object_servers
+
+from .version_range import VersionRange
+
+from .tag_version import ParsedTag
+from .tag_version import get_latest_numeric_tag
+
+from .git_push_queue import GitPushQueue
+from .git_push_queue import get_url_host
+
+from .git_tag_plan import CHANNEL_TAG_PLAN_FILE
+from .git_tag_plan import TAG_PLAN_VERSION
+from .git_tag_plan import CREATE_TAG_OPERATION
+from .git_tag_plan import RepositoryTagPlan
+
+from .commit_severity import parse_git_log
+from .commit_severity import get_git_log_command
+from .commit_severity import get_severity_name
+from .commit_severity import suggest_severity_level
+from .commit_severity import NO_CHANGES_SEVERITY
+
+from .generation_journal import CHANNEL_GENERATION_JOURNAL_FILE
+from .generation_journal import GenerationJournal
+from .generation_journal import get_journal_key
+
 # When there is an ImportError, means that Package Control is installed instead of PackagesManager,
 # or vice-versa. Which means we cannot do nothing as this is only compatible with PackagesManager.
 try:
     from PackagesManager.package_control.package_manager import PackageManager
     from PackagesManager.package_control.providers.channel_provider import ChannelProvider
+    from PackagesManager.package_control.providers.repository_provider import RepositoryProvider
 
     from PackagesManager.package_control import cmd
     from PackagesManager.package_control.thread_progress import ThreadProgress
@@ -64,6 +127,15 @@ try:
 except ImportError:
     pass
 
+# Without them, the default channel is loaded by the `ChannelProvider`
+try:
+    from PackagesManager.package_control.download_manager import downloader
+    from PackagesManager.package_control.download_manager import update_url
+
+except ImportError:
+    downloader = None
+    update_url = None
+
 
 # # How to reload a Sublime Text dependency?
 # # https://github.com/randy3k/AutomaticPackageReloader/issues/12
@@ -84,6 +156,15 @@ from debug_tools.estimated_time_left import CurrentUpdateProgress
 # Debugger settings: 0 - disabled, 127 - enabled
 log = getLogger( 127, __name__ )
 
+# The repositories fingerprints of the last `all` command, used by the incremental generation
+CHANNEL_FINGERPRINTS_FILE = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "all", "last_fingerprints.json" )
+
+# Increment this when the generated repositories entries change, to not reuse the old entries
+FINGERPRINTS_VERSION = 1
+
+# Only the last digit is matched because `.+` is greedy, and the old compatible versions rely on it
+VERSION_NUMBER_REGEX = re.compile( r'.+(\d+)$' )
+
 #log.setup( "Debug.txt" )
 #log.clear()
 
@@ -127,16 +208,38 @@ class GenerateChannelThread(threading.Thread):
 
             unpack_settings( self.channel_settings )
             g_failed_repositories = []
+            clear_git_tags_tables()
 
-            all_packages      = load_deafault_channel()
-            last_channel_file = load_repository_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'] )
+            # The entries are changed by the commands and the index is written again, then all
+            # of them are loaded from the repository file
+            last_channel_file = load_repository_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'], use_index=False )
 
-            # print_some_repositories( all_packages )
             if self.command == "all":
-                repositories, dependencies = create_repositories_list( all_packages, last_channel_file )
+                channel_profiles = get_channel_profiles()
+
+                # The repositories of all the profiles are processed once, then their files are saved
+                if len( channel_profiles ) > 1:
+                    unpack_settings( get_profiles_collection_settings( channel_profiles ) )
+
+                gitRepositories = load_git_repositories()
+                all_packages    = load_deafault_channel( set( repository.name for repository in gitRepositories ) )
+
+                # print_some_repositories( all_packages )
+                fingerprints = {} if is_incremental_generation() else None
+                generation_journal = open_generation_journal()
+
+                repositories, dependencies = create_repositories_list( gitRepositories, all_packages, last_channel_file,
+                        fingerprints, generation_journal )
 
                 log.newline()
-                self.save_log_file( repositories, dependencies )
+                self.save_log_file( repositories, dependencies, channel_profiles )
+
+                if fingerprints is not None:
+                    save_fingerprints_file( fingerprints )
+
+                # The generated files were saved, then the next run does not resume from the journal
+                if generation_journal is not None:
+                    generation_journal.remove()
 
             elif self.command == "git_tag":
                 self.repositories_list = ["Select this first item to start the updating... (0 items selected)"]
@@ -148,47 +251,98 @@ class GenerateChannelThread(threading.Thread):
                 self.exclusion_flag   = " (excluded)"
                 self.inclusion_flag   = " (selected)"
                 self.last_picked_item = 0
+                self.severity_levels  = {}
 
                 self.last_excluded_items = 0
                 show_quick_panel( sublime.active_window(), self.repositories_list, self.on_done )
 
             elif self.command == "git_tag_all":
                 index = 0
+                tagged_count = 0
+                skipped_count = 0
+
+                push_queue = create_git_push_queue()
+                skip_unchanged = is_skip_unchanged_repositories()
                 repositories_count = len( last_channel_file )
 
-                for package_name, pi in sequence_timer( last_channel_file, info_frequency=0 ):
-                    index += 1
+                try:
+
+                    for package_name, pi in sequence_timer( last_channel_file, info_frequency=0 ):
+                        index += 1
+
+                        if not g_is_already_running:
+                            raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
+
+                        # # For quick testing
+                        # if index > 5:
+                        #     break
 
-                    if not g_is_already_running:
-                        raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
+                        progress = progress_info( pi, set_progress )
+                        log.newline()
+                        log( 1, "{:s} Processing {:3d} of {:d} repositories ({:d} tagged, {:d} skipped)... {:s}".format(
+                                progress, index, repositories_count, tagged_count, skipped_count, package_name ) )
 
-                    # # For quick testing
-                    # if index > 5:
-                    #     break
+                        last_dictionary = last_channel_file.get( package_name, {} )
 
-                    progress = progress_info( pi, set_progress )
-                    log.newline()
-                    log( 1, "{:s} Processing {:3d} of {:d} repositories... {:s}".format( progress, index, repositories_count, package_name ) )
+                        if update_repository( last_dictionary, package_name, push_queue=push_queue, skip_unchanged=skip_unchanged ):
+                            tagged_count += 1
 
-                    last_dictionary = last_channel_file.get( package_name, {} )
-                    update_repository( last_dictionary, package_name )
+                        else:
+                            skipped_count += 1
+
+                finally:
+                    push_queue.join()
+
+                log.newline()
+                log( 1, "Tagged %d and skipped %d unchanged of %d repositories.", tagged_count, skipped_count, repositories_count )
 
                 repositories, dependencies = split_repositories_and_depencies( last_channel_file )
                 self.save_log_file( repositories, dependencies )
 
+            elif self.command == "git_tag_plan":
+                create_tag_plan( last_channel_file )
+
+            elif self.command == "git_tag_apply":
+
+                if apply_tag_plan( last_channel_file ):
+                    repositories, dependencies = split_repositories_and_depencies( last_channel_file )
+                    self.save_log_file( repositories, dependencies )
+
             elif self.command == "cancel_operation":
                 free_mutex_lock()
 
             else:
                 log( 1, "Invalid command: " + str( self.command ) )
 
-    def save_log_file(self, repositories, dependencies):
+    def save_log_file(self, repositories, dependencies, channel_profiles=None):
         """
-            @param repositories  a list of all repositories
-            @param dependencies  a list of all dependencies
+            @param repositories      a list of all repositories
+            @param dependencies      a list of all dependencies
+            @param channel_profiles  None, or the list returned by get_channel_profiles(), to save the
+                                     files of each profile with its packages
         """
-        create_channel_file( repositories, dependencies )
-        create_repository_file( repositories, dependencies )
+
+        if channel_profiles and len( channel_profiles ) > 1:
+            collection_settings = g_channelSettings
+
+            # All the profiles have the same packages entries, then they are only encoded once
+            repositories = EncodedList( repositories )
+            dependencies = EncodedList( dependencies )
+
+            try:
+
+                for profile_settings in channel_profiles:
+                    unpack_settings( profile_settings )
+                    log( 1, "Saving the channel profile files: %s", g_channelSettings['CHANNEL_FILE_PATH'] )
+
+                    save_channel_files( get_profile_entries( repositories, profile_settings ),
+                            get_profile_entries( dependencies, profile_settings ) )
+
+            finally:
+                unpack_settings( collection_settings )
+
+        else:
+            save_channel_files( repositories, dependencies )
 
         print_failed_repositories()
 
@@ -208,9 +362,10 @@ class GenerateChannelThread(threading.Thread):
                 show_quick_panel( sublime.active_window(), self.repositories_list, self.on_done )
 
             else:
-                severity_options = ["Go Back", "Cancel", "Custom", "No Changes", "Patch", "Minor", "Major"]
+                severity_options = ["Go Back", "Cancel", "Custom", "No Changes", "Patch", "Minor", "Major", "Suggested"]
 
                 def on_done_severity(picked_index):
+                    self.severity_levels = {}
 
                     if picked_index < 0 or picked_index == 1:
                         free_mutex_lock()
@@ -272,6 +427,11 @@ class GenerateChannelThread(threading.Thread):
                     elif picked_index == 6: # Major
                         self.severity_level = 1
 
+                    elif picked_index == 7: # Suggested
+                        thread = threading.Thread( target=self.show_suggested_severities )
+                        thread.start()
+                        return
+
                     else:
                         raise RuntimeError( "Invalid option picked: %s - %s" % ( picked_index, self.severity_level ) )
                         self.severity_level = picked_index
@@ -309,6 +469,72 @@ class GenerateChannelThread(threading.Thread):
 
             show_quick_panel( sublime.active_window(), self.repositories_list, self.on_done )
 
+    def show_suggested_severities(self):
+        """
+            Suggest the severity of each selected repository from its commits since the last tag,
+            then they can be tagged with their own severity, instead of picking one for all of them.
+        """
+        packages_names = self.get_selected_packages()
+        log( 1, "Analyzing the commits of %d repositories...", len( packages_names ) )
+
+        # The repositories whose commits could not be read are not tagged
+        self.severity_level  = NO_CHANGES_SEVERITY
+        self.severity_levels = {}
+
+        suggestions_list = ["Go Back", "Cancel", "Use the Suggested Severities"]
+
+        for package_name, suggestion in suggest_repositories_severities( packages_names ).items():
+
+            if suggestion is None:
+                suggestions_list.append( "%s: %s, could not read its commits" % ( package_name, get_severity_name( self.severity_level ) ) )
+                continue
+
+            self.severity_levels[package_name] = suggestion.severity_level
+
+            suggestions_list.append( "%s: %s, %d commits, %d files, %d lines, %s" % ( package_name,
+                    get_severity_name( suggestion.severity_level ), suggestion.commits_count, suggestion.files_changed,
+                    suggestion.lines_changed, suggestion.reason ) )
+            log( 1, suggestions_list[-1] )
+
+        def on_done_suggestion(picked_index):
+
+            if picked_index < 0 or picked_index == 1:
+                free_mutex_lock()
+                return
+
+            elif picked_index == 0:
+                self.severity_levels = {}
+                show_quick_panel( sublime.active_window(), self.repositories_list, self.on_done )
+                return
+
+            elif picked_index == 2:
+                thread = threading.Thread( target=self.on_done_async )
+                thread.start()
+                return
+
+            # The repositories suggestions are only informative
+            show_quick_panel( sublime.active_window(), suggestions_list, on_done_suggestion )
+
+        show_quick_panel( sublime.active_window(), suggestions_list, on_done_suggestion )
+
+    def get_selected_packages(self):
+        """
+            @return a list with the names of the packages selected and not excluded on the quick panel
+        """
+        packages_names = []
+
+        for package_name in self.repositories_list[1:self.last_picked_item + 1]:
+
+            if package_name.endswith( self.exclusion_flag ):
+                continue
+
+            if package_name.endswith( self.inclusion_flag ):
+                package_name = package_name[:-len( self.inclusion_flag )]
+
+            packages_names.append( package_name )
+
+        return packages_names
+
     def update_start_item_name(self):
         self.repositories_list[0] = "Start Updating... (%d items selected)" % ( self.get_total_items_selected() )
 
@@ -317,26 +543,34 @@ class GenerateChannelThread(threading.Thread):
 
     def on_done_async(self):
         save_items = False
+        push_queue = create_git_push_queue()
         log.newline()
 
-        for package_index, pi in sequence_timer( range( 1, self.last_picked_item + 1 ), info_frequency=0 ):
-            package_name = self.repositories_list[package_index]
+        try:
 
-            progress = progress_info( pi, set_progress )
-            log( 1, "{:s} Processing {:3d} of {:d} repositories... {:s}".format( progress, package_index, self.last_picked_item, package_name ) )
+            for package_index, pi in sequence_timer( range( 1, self.last_picked_item + 1 ), info_frequency=0 ):
+                package_name = self.repositories_list[package_index]
 
-            if package_name.endswith( self.exclusion_flag ):
-                log( 1, "Skipping `%s`..." % package_name )
-                continue
+                progress = progress_info( pi, set_progress )
+                log( 1, "{:s} Processing {:3d} of {:d} repositories... {:s}".format( progress, package_index, self.last_picked_item, package_name ) )
 
-            if package_name.endswith( self.inclusion_flag ):
-                package_name = package_name[:-len( self.inclusion_flag )]
+                if package_name.endswith( self.exclusion_flag ):
+                    log( 1, "Skipping `%s`..." % package_name )
+                    continue
 
-            save_items      = True
-            last_dictionary = self.last_channel_file.get( package_name, {} )
+                if package_name.endswith( self.inclusion_flag ):
+                    package_name = package_name[:-len( self.inclusion_flag )]
+
+                save_items      = True
+                last_dictionary = self.last_channel_file.get( package_name, {} )
+
+                severity_level  = self.severity_levels.get( package_name, self.severity_level )
+
+                update_repository( last_dictionary, package_name, severity_level, push_queue )
+                log.newline()
 
-            update_repository( last_dictionary, package_name, self.severity_level )
-            log.newline()
+        finally:
+            push_queue.join()
 
         if save_items:
             repositories, dependencies = split_repositories_and_depencies( self.last_channel_file )
@@ -351,197 +585,1146 @@ def split_repositories_and_depencies(repositories_dictionary):
         package_dicitonary             = repositories_dictionary[package_name]
         package_dicitonary['releases'] = sort_dictionaries_on_list( package_dicitonary['releases'] )
 
-        if "load_order" in package_dicitonary:
-            dependencies_list.append( package_dicitonary )
+        if "load_order" in package_dicitonary:
+            dependencies_list.append( package_dicitonary )
+
+        else:
+            packages_list.append( package_dicitonary )
+
+    return sort_list_of_dictionaries( packages_list), sort_list_of_dictionaries( dependencies_list )
+
+
+def update_repository(last_dictionary, package_name, severity_level=3, push_queue=None, tag_plan=None, skip_unchanged=False):
+    """
+        @param severity_level see the function get_last_tag_fixed() for the severity leves available
+        @param push_queue     None to push the repository tags now, or a `GitPushQueue` to push them
+                              while the next repositories are tagged
+        @param tag_plan       None to tag and push the repository, or a `RepositoryTagPlan` to only
+                              record the changes, without changing the repository or `last_dictionary`
+        @param skip_unchanged if True, the repositories without changes since their latest tag are
+                              not tagged again, only their release is updated with the latest tag
+
+        @return False when the repository was skipped because it did not change since its latest tag
+    """
+    log( 1, "Updating repository... %s" % ( str( package_name ) ) )
+
+    command_line_interface = cmd.Cli( None, True )
+    absolute_path = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], "Packages", package_name )
+
+    pushed_refspecs = []
+    is_changed = True
+
+    if skip_unchanged:
+        latest_tag = get_git_latest_tag( absolute_path, command_line_interface )
+        is_changed = is_changed_since_tag( absolute_path, latest_tag, command_line_interface )
+
+        if not is_changed:
+            log( 1, "Skipping the package `%s` without changes since its tag `%s`.", package_name, latest_tag )
+
+    git_tag, date_tag, release_date = get_last_tag_fixed( absolute_path, last_dictionary, command_line_interface, is_changed,
+            severity_level, pushed_refspecs, tag_plan )
+
+    release_data = last_dictionary['releases'][0]
+
+    # Only push the new tag, if it is not created yet.
+    if release_data['git_tag'] != git_tag:
+        pushed_refspecs.append( git_tag )
+
+    updated_release = get_updated_release( release_data, git_tag, date_tag, release_date )
+
+    if tag_plan is not None:
+        tag_plan.pushed_refspecs = pushed_refspecs
+        tag_plan.release = updated_release
+        return is_changed
+
+    push_repository( absolute_path, pushed_refspecs, command_line_interface, push_queue )
+    release_data.update( updated_release )
+
+    return is_changed
+
+
+def is_changed_since_tag(absolute_path, git_tag, command_line_interface):
+    """
+        The repository did not change since its `git_tag` when HEAD is the tagged commit, when HEAD
+        has no commits which are not on the tagged commit history, or when these commits did not
+        change any file, as the empty, merge or reverted commits.
+
+        @return True when the repository HEAD should be tagged
+    """
+
+    # The repositories without tags are always tagged
+    if git_tag == "master":
+        return True
+
+    git_tags_table = get_git_tags_table( absolute_path, command_line_interface )
+    tag = git_tags_table and git_tags_table.get( git_tag )
+
+    if tag and git_tags_table.resolve_tag( tag ).commit == git_tags_table.get_head( command_line_interface ):
+        log( 1, "The HEAD commit is the tag `%s` commit.", git_tag )
+        return False
+
+    command = [ "git", "rev-list", "--count", "refs/tags/%s..HEAD" % git_tag ]
+    output  = command_line_interface.execute( command, absolute_path, short_errors=True )
+
+    if output is False or not output.strip().isdigit():
+        log( 1, "Warning: Could not count the commits since the tag `%s` of the package `%s`: %s", git_tag, absolute_path, output )
+        return True
+
+    commits_count = int( output.strip() )
+
+    if commits_count == 0:
+        log( 1, "There are no commits since the tag `%s`.", git_tag )
+        return False
+
+    command = [ "git", "rev-parse", "refs/tags/%s^{tree}" % git_tag, "HEAD^{tree}" ]
+    output  = command_line_interface.execute( command, absolute_path, short_errors=True )
+
+    trees = output.split() if output else []
+
+    if len( trees ) == 2 and trees[0] == trees[1]:
+        log( 1, "The %d commits since the tag `%s` did not change any file.", commits_count, git_tag )
+        return False
+
+    log( 1, "There are %d commits since the tag `%s`.", commits_count, git_tag )
+    return True
+
+
+def suggest_repositories_severities(packages_names):
+    """
+        Read the commits since the latest tag of each repository with one `git log` call, analyzing
+        up to `CHANNEL_MAXIMUM_WORKERS` repositories at the same time.
+
+        @return an OrderedDict with the `SeveritySuggestion` of each package name, or None when its
+                commits could not be read
+    """
+
+    def suggest(package_name):
+        command_line_interface = cmd.Cli( None, True )
+        absolute_path = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], "Packages", package_name )
+
+        git_tag = get_git_latest_tag( absolute_path, command_line_interface )
+        command = get_git_log_command( None if git_tag == "master" else git_tag )
+        output  = command_line_interface.execute( command, absolute_path, short_errors=True )
+
+        if output is False:
+            log( 1, "Error: Could not read the commits since the tag `%s` of the package `%s`.", git_tag, package_name )
+            return None
+
+        return suggest_severity_level( parse_git_log( output ) )
+
+    return OrderedDict( zip( packages_names, run_in_order( suggest, packages_names, get_maximum_workers() ) ) )
+
+
+def get_updated_release(release_data, git_tag, date_tag, release_date):
+    """
+        @return a dictionary with the `release_data` values after the repository was tagged
+    """
+    updated_release = OrderedDict()
+
+    updated_release['date']    = release_date
+    updated_release['version'] = date_tag
+
+    # Check this to do not erase the tagged branch
+    if 'is_branched_tag' not in release_data:
+        updated_release['url']     = release_data['url'].replace( release_data['git_tag'], git_tag )
+        updated_release['git_tag'] = git_tag
+
+    return updated_release
+
+
+def push_repository(absolute_path, pushed_refspecs, command_line_interface, push_queue=None):
+    """
+        The deleted tags and the new tag are pushed together.
+    """
+
+    if push_queue and pushed_refspecs:
+        push_queue.put( get_git_remote_host( absolute_path, command_line_interface ), absolute_path, pushed_refspecs )
+
+    else:
+        push_git_refspecs( absolute_path, pushed_refspecs, command_line_interface )
+
+
+def create_tag_plan(last_channel_file, severity_level=3):
+    """
+        Record the tags which the `git_tag_all` command would create, delete and push, without
+        changing any repository, and save them on the `CHANNEL_TAG_PLAN_FILE`.
+
+        @return an OrderedDict with the `RepositoryTagPlan` of each package name
+    """
+    repositories_plans = OrderedDict()
+    repositories_count = len( last_channel_file )
+
+    skipped_count  = 0
+    skip_unchanged = is_skip_unchanged_repositories()
+
+    for index, ( package_name, pi ) in enumerate( sequence_timer( last_channel_file, info_frequency=0 ), 1 ):
+
+        if not g_is_already_running:
+            raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
+
+        progress = progress_info( pi, set_progress )
+        log.newline()
+        log( 1, "{:s} Planning {:3d} of {:d} repositories... {:s}".format( progress, index, repositories_count, package_name ) )
+
+        # Its new tags also commit and push its `package-metadata.json` version, see the function
+        # create_packages_manager_tag(), whose commit and date cannot be planned
+        if package_name == 'PackagesManager':
+            log( 1, "Warning: Skipping the package `%s`, it can only be tagged by the `git_tag` commands.", package_name )
+            skipped_count += 1
+            continue
+
+        tag_plan = RepositoryTagPlan()
+
+        if not update_repository( last_channel_file.get( package_name, {} ), package_name, tag_plan=tag_plan,
+                skip_unchanged=skip_unchanged ):
+            skipped_count += 1
+
+        repositories_plans[package_name] = tag_plan
+
+    changed_repositories = [ package_name for package_name, tag_plan in repositories_plans.items() if tag_plan.is_changed() ]
+    log.newline()
+
+    for package_name in changed_repositories:
+        tag_plan = repositories_plans[package_name]
+
+        log( 1, "{:s}: create {:s}, delete {:s}, push {:s}, version {:s}".format( package_name,
+                str( tag_plan.get_created_tags() ), str( tag_plan.get_deleted_tags() ), str( tag_plan.pushed_refspecs ),
+                str( tag_plan.release.get( 'version' ) ) ) )
+
+    log( 1, "The tag plan changes %d of %d repositories, skipping %d unchanged, saving it on: %s", len( changed_repositories ),
+            repositories_count, skipped_count, CHANNEL_TAG_PLAN_FILE )
+
+    save_tag_plan_file( severity_level, repositories_plans )
+    return repositories_plans
+
+
+def apply_tag_plan(last_channel_file):
+    """
+        Apply the last plan created by create_tag_plan(). Only the repositories with tags to change
+        are tagged and pushed, and the ones whose HEAD or latest tag changed after the plan was
+        created are skipped, including the unchanged ones, as their planned release is outdated.
+
+        @return True when the plan was applied, and the `last_channel_file` releases were updated
+    """
+    repositories_plans = load_tag_plan_file()
+
+    if repositories_plans is None:
+        log( 1, "Error: There is no tag plan for the channel `%s` on: %s", g_channelSettings['CHANNEL_REPOSITORY_FILE'], CHANNEL_TAG_PLAN_FILE )
+        return False
+
+    push_queue = create_git_push_queue()
+    changed_count = 0
+
+    try:
+
+        for package_name, tag_plan in repositories_plans.items():
+            last_dictionary = last_channel_file.get( package_name )
+
+            if not last_dictionary or 'releases' not in last_dictionary:
+                log( 1, "Warning: Skipping the package `%s` which is not on the channel anymore.", package_name )
+                continue
+
+            if not g_is_already_running:
+                raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
+
+            if not apply_repository_tag_plan( package_name, tag_plan, push_queue ):
+                continue
+
+            if tag_plan.is_changed():
+                changed_count += 1
+
+            last_dictionary['releases'][0].update( tag_plan.release )
+
+    finally:
+        push_queue.join()
+
+    log( 1, "The tag plan changed %d of %d repositories.", changed_count, len( repositories_plans ) )
+    return True
+
+
+def apply_repository_tag_plan(package_name, tag_plan, push_queue=None):
+    """
+        @return True when the repository did not change since the plan was created and the planned
+                operations were done, then the release can be updated
+    """
+    log( 1, "Applying the tag plan... %s" % ( str( package_name ) ) )
+
+    command_line_interface = cmd.Cli( None, True )
+    absolute_path = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], "Packages", package_name )
+
+    if get_git_head( absolute_path, command_line_interface ) != tag_plan.head \
+            or get_git_latest_tag( absolute_path, command_line_interface ) != tag_plan.latest_tag:
+
+        log( 1, "Error: The package `%s` changed after the tag plan was created, create the plan again.", package_name )
+        add_failed_repository( "git_tag_apply", absolute_path )
+        return False
+
+    if not tag_plan.is_changed():
+        return True
+
+    for operation, argument in tag_plan.operations:
+
+        if operation == CREATE_TAG_OPERATION:
+
+            if not create_git_tag( absolute_path, argument, command_line_interface ):
+                return False
+
+        else:
+            # The remote tags are deleted by the planned refspecs
+            delete_tags_list( absolute_path, argument, command_line_interface, [] )
+
+    push_repository( absolute_path, tag_plan.pushed_refspecs, command_line_interface, push_queue )
+    return True
+
+
+def load_tag_plan_file():
+    """
+        @return an OrderedDict with the `RepositoryTagPlan` of each package name, or None when there
+                is no plan for the current channel
+    """
+    tag_plan_file = load_data_file( CHANNEL_TAG_PLAN_FILE )
+
+    if tag_plan_file.get( 'version' ) != TAG_PLAN_VERSION \
+            or tag_plan_file.get( 'channel' ) != g_channelSettings['CHANNEL_REPOSITORY_FILE']:
+        return None
+
+    repositories_plans = OrderedDict()
+
+    for package_name, tag_plan in tag_plan_file.get( 'repositories', [] ):
+        repositories_plans[package_name] = RepositoryTagPlan.from_dict( tag_plan )
+
+    return repositories_plans
+
+
+def save_tag_plan_file(severity_level, repositories_plans):
+    tag_plan_file = OrderedDict()
+
+    tag_plan_file['version'] = TAG_PLAN_VERSION
+    tag_plan_file['channel'] = g_channelSettings['CHANNEL_REPOSITORY_FILE']
+    tag_plan_file['severity_level'] = severity_level
+
+    # A list keeps the repositories on the same order they were planned
+    tag_plan_file['repositories'] = [ [ package_name, tag_plan.to_dict() ] for package_name, tag_plan in repositories_plans.items() ]
+    write_data_file( CHANNEL_TAG_PLAN_FILE, tag_plan_file )
+
+
+def create_git_push_queue():
+    """
+        The `CHANNEL_MAXIMUM_PUSH_WORKERS` setting defines how many repositories are pushed at the
+        same time, and `CHANNEL_MAXIMUM_HOST_PUSHES` how many of them can be pushed to the same host.
+        Values lower than 1 push each repository right after tagging it.
+    """
+    maximum_workers     = g_channelSettings.get( 'CHANNEL_MAXIMUM_PUSH_WORKERS', 8 )
+    maximum_host_pushes = g_channelSettings.get( 'CHANNEL_MAXIMUM_HOST_PUSHES', 4 )
+
+    try:
+        maximum_workers     = int( maximum_workers )
+        maximum_host_pushes = int( maximum_host_pushes )
+
+    except ( TypeError, ValueError ):
+        log( 1, "Warning: Invalid CHANNEL_MAXIMUM_PUSH_WORKERS `%s` or CHANNEL_MAXIMUM_HOST_PUSHES `%s` settings, "
+                "pushing one repository at a time.", maximum_workers, maximum_host_pushes )
+
+        maximum_workers, maximum_host_pushes = 0, 1
+
+    return GitPushQueue( push_repository_refspecs, maximum_workers, maximum_host_pushes )
+
+
+def push_repository_refspecs(absolute_path, refspecs):
+    """
+        Called by the `GitPushQueue` workers, each one with its own `cmd.Cli` instance.
+    """
+    log( 1, "Pushing the package `%s` refspecs: %s", os.path.basename( absolute_path ), refspecs )
+    push_git_refspecs( absolute_path, refspecs, cmd.Cli( None, True ) )
+
+
+def get_git_head(absolute_path, command_line_interface):
+    """
+        @return the HEAD commit, or None when it could not be read
+    """
+    git_tags_table = get_git_tags_table( absolute_path, command_line_interface )
+
+    if git_tags_table is not None:
+        return git_tags_table.get_head( command_line_interface )
+
+    command = shlex.split( "git rev-parse HEAD" )
+    output  = command_line_interface.execute( command, absolute_path, short_errors=True )
+
+    return output.strip() if output else None
+
+
+def get_git_head_date(absolute_path, command_line_interface):
+    """
+        The date a new tag created on HEAD would have, without creating it.
+
+        @return release_date `2018-02-16 01:40:11`
+    """
+    git_tags_table = get_git_tags_table( absolute_path, command_line_interface )
+
+    if git_tags_table is not None and git_tags_table.reader is not None:
+        head = git_tags_table.get_head( command_line_interface )
+        peeled_object = head and git_tags_table.reader.peel_object( head )
+
+        if peeled_object and peeled_object[1]:
+            return peeled_object[1][0:19]
+
+    return _get_git_tag_date( absolute_path, command_line_interface, "HEAD" )
+
+
+def get_git_remote_host(absolute_path, command_line_interface):
+    """
+        @return the origin remote host name, or an empty string when it is a local repository
+    """
+    command = shlex.split( "git config --get remote.origin.url" )
+    output  = command_line_interface.execute( command, absolute_path, short_errors=True )
+
+    return get_url_host( output or "" )
+
+
+def add_failed_repository(command, absolute_path):
+    """
+        Thread safe way to register a failed command, as the repositories can be processed by
+        several workers at the same time.
+    """
+
+    with g_failed_repositories_lock:
+        g_failed_repositories.append( (command, absolute_path) )
+
+
+def is_failed_repository(absolute_path):
+
+    with g_failed_repositories_lock:
+        return any( failed_path == absolute_path for command, failed_path in g_failed_repositories )
+
+
+def print_failed_repositories():
+
+    with g_failed_repositories_lock:
+        failed_repositories = list( g_failed_repositories )
+
+    if len( failed_repositories ) > 0:
+        log.newline( count=2 )
+        log( 1, "The following repositories failed their commands..." )
+
+    for command, repository in failed_repositories:
+        log( 1, "Command: %s (%s)" % ( command, repository ) )
+
+
+def get_command_line_interface():
+    """
+        Each worker thread uses its own `cmd.Cli` instance, instead of sharing one between them.
+    """
+
+    if not hasattr( g_thread_local_storage, "command_line_interface" ):
+        g_thread_local_storage.command_line_interface = cmd.Cli( None, False )
+
+    return g_thread_local_storage.command_line_interface
+
+
+def get_maximum_workers():
+    """
+        The `CHANNEL_MAXIMUM_WORKERS` setting defines how many repositories are processed at the same
+        time. Values lower than 2 process them serially, one after another.
+    """
+    maximum_workers = g_channelSettings.get( 'CHANNEL_MAXIMUM_WORKERS', 1 )
+
+    try:
+        return max( 1, int( maximum_workers ) )
+
+    except ( TypeError, ValueError ):
+        log( 1, "Warning: Invalid CHANNEL_MAXIMUM_WORKERS setting `%s`, using 1 worker.", maximum_workers )
+        return 1
+
+
+def run_in_order(function, arguments_list, maximum_workers):
+    """
+        Call `function` for each item on `arguments_list` and yield their results in the same order
+        as `arguments_list`, regardless of which one finishes first.
+
+        When `maximum_workers` is lower than 2, each item is only processed when its result is
+        requested, i.e., serially. Otherwise, all items are queued to a bounded thread pool and the
+        pending ones are cancelled if the caller stops consuming the results.
+    """
+
+    if maximum_workers < 2:
+
+        for arguments in arguments_list:
+            yield function( arguments )
+
+        return
+
+    with concurrent.futures.ThreadPoolExecutor( maximum_workers ) as executor:
+        futures = [ executor.submit( function, arguments ) for arguments in arguments_list ]
+
+        try:
+
+            for future in futures:
+                yield future.result()
+
+        except BaseException:
+
+            for future in futures:
+                future.cancel()
+
+            raise
+
+
+@contextlib.contextmanager
+def lock_context_manager():
+    """
+        https://stackoverflow.com/questions/12594148/skipping-execution-of-with-block
+        https://stackoverflow.com/questions/27071524/python-context-manager-not-cleaning-up
+        https://stackoverflow.com/questions/10447818/python-context-manager-conditionally-executing-body
+        https://stackoverflow.com/questions/34775099/why-does-contextmanager-throws-a-runtime-error-generator-didnt-stop-after-thro
+    """
+    try:
+        yield is_allowed_to_run()
+
+    finally:
+        free_mutex_lock()
+
+
+def free_mutex_lock():
+    global g_is_already_running
+    g_is_already_running = False
+
+    # The git processes are only kept open while the command is running, or until it is cancelled
+    get_git_object_servers().close()
+    git_metadata_cache = get_opened_git_metadata_cache()
+
+    if git_metadata_cache:
+        git_metadata_cache.flush()
+
+
+def is_allowed_to_run():
+    """
+        Returns `True` when it is allowed to run the channel manager, `False` otherwise.
+    """
+    global g_is_already_running
+
+    if g_is_already_running:
+        print( "You are already running a command. Wait until it finishes or restart Sublime Text" )
+        return False
+
+    g_is_already_running = True
+    return True
+
+
+def load_deafault_channel(wanted_names=None):
+    """
+        @param wanted_names None to load all the default channel packages, or a set with the only
+                            packages names which are used
+    """
+    package_manager = PackageManager()
+    is_filtered = wanted_names is not None and is_filtered_default_channel()
+
+    # The `ChannelProvider` always downloads the channel, then the offline run only loads the snapshot
+    if is_filtered or is_default_channel_offline():
+        default_channel_url = g_channelSettings['DEFAULT_CHANNEL_URL']
+
+        def fix_url(url):
+            return update_url( url, package_manager.settings.get( 'debug' ) ) if update_url else url
+
+        try:
+            return load_channel_packages( download_default_channel( package_manager.settings ),
+                    wanted_names if is_filtered else None, fix_url )
+
+        except Exception as error:
+
+            if is_default_channel_offline():
+                log( 1, "Error: Could not load the default channel `%s` offline: %s", default_channel_url, error )
+                raise
+
+            log( 1, "Warning: Could not load the default channel `%s` filtered, loading all its packages: %s", default_channel_url, error )
+
+    channel_provider = ChannelProvider( g_channelSettings['DEFAULT_CHANNEL_URL'], package_manager.settings )
+
+    return load_channel_sources( channel_provider, get_maximum_connections(),
+            lambda source: RepositoryProvider( source, package_manager.settings ) )
+
+
+def load_channel_sources(channel_provider, maximum_connections, create_repository_provider):
+    """
+        Load the packages of all the channel repositories sources. The `ChannelProvider` only reads
+        the sources packages from the channel file `packages_cache`, then only the sources which are
+        not cached there are downloaded, up to `maximum_connections` at the same time.
+
+        The packages are merged in the same order as the sources, then the packages of the later
+        sources replace the packages with the same name on the earlier ones.
+
+        @param channel_provider           an object with the `ChannelProvider` methods `get_sources()`
+                                          and `get_packages(source)`
+        @param create_repository_provider a function which receives a source url and returns an object
+                                          with the `RepositoryProvider` method `get_packages()`
+    """
+    channel_repositories = channel_provider.get_sources()
+    cached_packages = [ channel_provider.get_packages( source ) for source in channel_repositories ]
+
+    uncached_sources = [ source for source, packages in zip( channel_repositories, cached_packages ) if not packages ]
+
+    def download_packages(source):
+
+        try:
+            return dict( create_repository_provider( source ).get_packages() )
+
+        except Exception as error:
+            log( 1, "Warning: Could not load the default channel source `%s`: %s", source, error )
+            return {}
+
+    downloaded_packages = dict( zip( uncached_sources, run_in_order( download_packages, uncached_sources, maximum_connections ) ) )
+    all_packages = {}
+
+    for source, packages in zip( channel_repositories, cached_packages ):
+        all_packages.update( packages or downloaded_packages[source] )
+
+    return all_packages
+
+
+def get_maximum_connections():
+    """
+        The `CHANNEL_MAXIMUM_CONNECTIONS` setting defines how many default channel repositories
+        sources not cached on the channel file are downloaded at the same time. Values lower than
+        2 download them serially.
+    """
+    maximum_connections = g_channelSettings.get( 'CHANNEL_MAXIMUM_CONNECTIONS', 4 )
+
+    try:
+        return max( 1, int( maximum_connections ) )
+
+    except ( TypeError, ValueError ):
+        log( 1, "Warning: Invalid CHANNEL_MAXIMUM_CONNECTIONS setting `%s`, using 1 connection.", maximum_connections )
+        return 1
+
+
+def is_filtered_default_channel():
+    """
+        The `CHANNEL_FILTERED_DEFAULT_CHANNEL` setting allows to disable parsing only the default
+        channel packages which are on the `.gitmodules` file, and use the `ChannelProvider` instead.
+    """
+    return bool( downloader and update_url and g_channelSettings.get( 'CHANNEL_FILTERED_DEFAULT_CHANNEL', True ) )
+
+
+def is_default_channel_offline():
+    """
+        The `CHANNEL_DEFAULT_CHANNEL_OFFLINE` setting allows to only use the default channel local
+        snapshot, without contacting its server.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_DEFAULT_CHANNEL_OFFLINE', False ) )
+
+
+def download_default_channel(settings):
+    """
+        The channel is saved on a local snapshot, which is used for `CHANNEL_DEFAULT_CHANNEL_CACHE_TIME`
+        seconds. After that, the server is only asked whether the channel changed since the snapshot.
+
+        @return the `DEFAULT_CHANNEL_URL` contents
+    """
+    default_channel_url = g_channelSettings['DEFAULT_CHANNEL_URL']
+
+    def fallback_download(url):
+
+        with downloader( url, settings ) as manager:
+            return manager.fetch( url, 'Error downloading channel.' )
+
+    channel_snapshot = ChannelSnapshot( default_channel_url, proxies=get_proxies( settings ) )
+    channel_contents = channel_snapshot.get_contents( g_channelSettings.get( 'CHANNEL_DEFAULT_CHANNEL_CACHE_TIME', 3600 ),
+            is_default_channel_offline(), fallback_download if downloader else None )
+
+    return channel_contents.decode( 'utf-8' )
+
+
+def save_channel_files(repositories, dependencies):
+    """
+        Save the `channel.json` and `repository.json` files, and the other files enabled by the
+        settings, as the channel delta and the compressed files.
+
+        @param repositories  a list or an `EncodedList` with all the repositories
+        @param dependencies  a list or an `EncodedList` with all the dependencies
+    """
+    last_entries = None
+
+    # The last generated entries are read before the files are overwritten
+    if is_channel_delta_enabled():
+        last_entries = load_repository_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'], use_index=False )
+        base_digests = get_channel_files_digests()
+
+    # Both files have the same packages entries, then they are only encoded once
+    if not isinstance( repositories, EncodedList ):
+        repositories = EncodedList( repositories )
+        dependencies = EncodedList( dependencies )
+
+    create_channel_file( repositories, dependencies )
+    repository_files = create_repository_file( repositories, dependencies )
+    channel_files = [ g_channelSettings['CHANNEL_FILE_PATH'] ] + repository_files
+
+    if is_repository_index_enabled():
+        write_repository_index( g_channelSettings['CHANNEL_REPOSITORY_FILE'], repository_files, repositories.entries,
+                dependencies.entries )
+
+    if is_build_views_enabled():
+        channel_files.extend( write_build_views( get_channel_builds_file(), g_channelSettings['CHANNEL_REPOSITORY_URL'],
+                repositories.entries, dependencies.entries ) )
+
+    if last_entries:
+        channel_delta = create_channel_delta( last_entries, repositories, dependencies, base_digests,
+                get_channel_files_digests() )
+
+        write_json_file( get_channel_delta_file(), channel_delta )
+        channel_files.append( get_channel_delta_file() )
+
+    # The compressed files are written after the lock is freed, on their own thread
+    if is_compressed_files_enabled():
+        compress_channel_files_async( channel_files, get_channel_manifest_file() )
+
+
+def get_channel_profiles():
+    """
+        The `CHANNEL_PROFILES` setting is a list of settings dictionaries, each one overriding some
+        channel settings to save other channel files from the same repositories, as a channel with
+        only the `PACKAGES_TO_INSTALL_EXCLUSIVELY` packages. Each profile must set other files on
+        its `CHANNEL_FILE_PATH` and `CHANNEL_REPOSITORY_FILE` settings, and other url on its
+        `CHANNEL_REPOSITORY_URL` setting, which is the key of its channel `packages_cache`.
+
+        @return a list with the channel settings, followed by the settings of each valid profile
+    """
+    channel_profiles = [ g_channelSettings ]
+    output_files = { os.path.normpath( g_channelSettings[name] ) for name in ( 'CHANNEL_FILE_PATH', 'CHANNEL_REPOSITORY_FILE' ) }
+    repository_urls = { g_channelSettings.get( 'CHANNEL_REPOSITORY_URL' ) }
+
+    for profile in g_channelSettings.get( 'CHANNEL_PROFILES', [] ):
+
+        if not isinstance( profile, dict ):
+            log( 1, "Warning: Skipping the invalid CHANNEL_PROFILES profile `%s`, it must be a dictionary.", profile )
+            continue
+
+        profile_settings = dict( g_channelSettings )
+        profile_settings.update( profile )
+        profile_settings.pop( 'CHANNEL_PROFILES', None )
+
+        profile_files = { os.path.normpath( profile_settings[name] ) for name in ( 'CHANNEL_FILE_PATH', 'CHANNEL_REPOSITORY_FILE' ) }
+
+        if len( profile_files ) < 2 or profile_files & output_files:
+            log( 1, "Warning: Skipping the CHANNEL_PROFILES profile `%s`, its files are used by other channel.", profile )
+            continue
+
+        if profile_settings.get( 'CHANNEL_REPOSITORY_URL' ) in repository_urls:
+            log( 1, "Warning: Skipping the CHANNEL_PROFILES profile `%s`, its CHANNEL_REPOSITORY_URL is used by other channel.", profile )
+            continue
+
+        output_files.update( profile_files )
+        repository_urls.add( profile_settings['CHANNEL_REPOSITORY_URL'] )
+        channel_profiles.append( profile_settings )
+
+    return channel_profiles
+
+
+def get_profiles_collection_settings(channel_profiles):
+    """
+        @return the channel settings with the `PACKAGES_TO_INSTALL_EXCLUSIVELY` packages of all the
+                profiles, or all the packages when some profile has all of them
+    """
+    collection_settings = dict( channel_profiles[0] )
+    exclusive_packages = set()
+
+    for profile_settings in channel_profiles:
+
+        if not profile_settings['PACKAGES_TO_INSTALL_EXCLUSIVELY']:
+            exclusive_packages = set()
+            break
+
+        exclusive_packages.update( profile_settings['PACKAGES_TO_INSTALL_EXCLUSIVELY'] )
+
+    collection_settings['PACKAGES_TO_INSTALL_EXCLUSIVELY'] = sorted( exclusive_packages )
+    return collection_settings
+
+
+def get_profile_entries(encoded_list, profile_settings):
+    """
+        @param encoded_list an `EncodedList` with the entries of all the profiles
+        @return an `EncodedList` with only the entries of the profile packages
+    """
+    exclusive_packages = set( profile_settings['PACKAGES_TO_INSTALL_EXCLUSIVELY'] )
+
+    if not exclusive_packages:
+        return encoded_list
+
+    return encoded_list.subset( [ index for index, entry in enumerate( encoded_list.entries ) if entry['name'] in exclusive_packages ] )
+
+
+def create_repository_file(repositories, dependencies):
+    """
+        @return a list with the written files paths
+    """
+
+    if is_sharded_repository_file():
+        shards_paths = write_sharded_repository_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'], repositories,
+                dependencies, get_repository_shard_size() )
+
+        return [ g_channelSettings['CHANNEL_REPOSITORY_FILE'] ] + shards_paths
+
+    repository_file = OrderedDict()
+    repository_file['schema_version'] = "3.0.0"
+
+    repository_file['packages']     = repositories
+    repository_file['dependencies'] = dependencies
+
+    # print_data_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'] )
+    write_json_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'], repository_file )
+    return [ g_channelSettings['CHANNEL_REPOSITORY_FILE'] ]
+
+
+def is_sharded_repository_file():
+    """
+        When the `CHANNEL_REPOSITORY_SHARDS` setting is enabled, the `repository.json` file only
+        includes the shards files with its packages, then the clients only download the changed ones.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_REPOSITORY_SHARDS', False ) )
+
+
+def get_repository_shard_size():
+    """
+        The `CHANNEL_REPOSITORY_SHARD_SIZE` setting defines the shards size budget in bytes. The shards
+        larger than it are split by their packages names prefixes. Values lower than 1 only group the
+        packages by their first letter.
+    """
+    shard_size = g_channelSettings.get( 'CHANNEL_REPOSITORY_SHARD_SIZE', 262144 )
+
+    try:
+        return max( 0, int( shard_size ) )
+
+    except ( TypeError, ValueError ):
+        log( 1, "Warning: Invalid CHANNEL_REPOSITORY_SHARD_SIZE setting `%s`, using 262144 bytes.", shard_size )
+        return 262144
+
+
+def is_channel_delta_enabled():
+    """
+        When the `CHANNEL_DELTA_FILE` setting is enabled, the entries changed since the last generated
+        channel files are also saved on the file returned by get_channel_delta_file().
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_DELTA_FILE', False ) )
+
+
+def get_channel_delta_file():
+    return os.path.splitext( g_channelSettings['CHANNEL_FILE_PATH'] )[0] + ".delta.json"
+
+
+def is_build_views_enabled():
+    """
+        When the `CHANNEL_BUILD_VIEWS` setting is enabled, one channel file for each range of Sublime
+        Text builds is also saved, with only the release used by those builds for each package.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_BUILD_VIEWS', False ) )
+
+
+def get_channel_builds_file():
+    return os.path.splitext( g_channelSettings['CHANNEL_FILE_PATH'] )[0] + "_builds.json"
+
+
+def is_repository_index_enabled():
+    """
+        When the `CHANNEL_REPOSITORY_INDEX` setting is enabled, the `repository.json.index` file is
+        also saved, then the function load_repository_file() can read single packages without
+        parsing the whole repository file.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_REPOSITORY_INDEX', False ) )
+
+
+def is_compressed_files_enabled():
+    """
+        When the `CHANNEL_COMPRESSED_FILES` setting is enabled, the generated channel files are also
+        saved compressed, with their sizes and digests on the file returned by get_channel_manifest_file().
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_COMPRESSED_FILES', False ) )
+
+
+def get_channel_manifest_file():
+    return os.path.splitext( g_channelSettings['CHANNEL_FILE_PATH'] )[0] + ".manifest.json"
+
+
+def get_channel_files_digests():
+    """
+        @return an OrderedDict with the channel files names and their sha256 digests
+    """
+    digests = OrderedDict()
+
+    for file_path in ( g_channelSettings['CHANNEL_FILE_PATH'], g_channelSettings['CHANNEL_REPOSITORY_FILE'] ):
+        digests[os.path.basename( file_path )] = get_file_digest( file_path )
+
+    return digests
+
+
+def create_channel_file(repositories, dependencies):
+    channel_dictionary = OrderedDict()
+
+    channel_dictionary['repositories'] = []
+    channel_dictionary['repositories'].append( g_channelSettings['CHANNEL_REPOSITORY_URL'] )
+
+    channel_dictionary['schema_version'] = "3.0.0"
+    channel_dictionary['packages_cache'] = OrderedDict()
+    channel_dictionary['packages_cache'][g_channelSettings['CHANNEL_REPOSITORY_URL']] = repositories
+
+    channel_dictionary['dependencies_cache'] = OrderedDict()
+    channel_dictionary['dependencies_cache'][g_channelSettings['CHANNEL_REPOSITORY_URL']] = dependencies
+
+    # print_data_file( g_channelSettings['CHANNEL_FILE_PATH'] )
+    write_json_file( g_channelSettings['CHANNEL_FILE_PATH'], channel_dictionary )
+
+
+def is_incremental_generation():
+    """
+        When the `CHANNEL_INCREMENTAL_GENERATION` setting is enabled, the repositories which did not
+        change since the last `all` command reuse their last `repository.json` entry.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_INCREMENTAL_GENERATION', False ) )
+
+
+def load_fingerprints_file():
+    """
+        @return a dictionary with the last repositories fingerprints of the current channel
+    """
+    fingerprints_file = load_data_file( CHANNEL_FINGERPRINTS_FILE )
+    return fingerprints_file.get( g_channelSettings['CHANNEL_REPOSITORY_FILE'], {} )
+
 
-        else:
-            packages_list.append( package_dicitonary )
+def save_fingerprints_file(fingerprints):
+    """
+        Only call this after the `repository.json` file is saved, otherwise the fingerprints would
+        point to repositories entries which were not written.
+    """
+    fingerprints_file = load_data_file( CHANNEL_FINGERPRINTS_FILE )
+    fingerprints_file[g_channelSettings['CHANNEL_REPOSITORY_FILE']] = fingerprints
 
-    return sort_list_of_dictionaries( packages_list), sort_list_of_dictionaries( dependencies_list )
+    write_data_file( CHANNEL_FINGERPRINTS_FILE, fingerprints_file )
 
 
-def update_repository(last_dictionary, package_name, severity_level=3):
+def load_git_repositories():
     """
-        @param severity_level see the function get_last_tag_fixed() for the severity leves available
+        @return a list with the `Repository` of each `.gitmodules` section
     """
-    log( 1, "Updating repository... %s" % ( str( package_name ) ) )
+    gitFilePath    = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], '.gitmodules' )
+    gitModulesFile = configparser.RawConfigParser()
 
-    command_line_interface = cmd.Cli( None, True )
-    absolute_path = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], "Packages", package_name )
+    gitModulesFile.read( gitFilePath )
+    log( 1, "gitModulesFile: %s", gitFilePath )
 
-    git_tag, date_tag, release_date = get_last_tag_fixed( absolute_path, last_dictionary, command_line_interface, True, severity_level )
-    release_data = last_dictionary['releases'][0]
+    return get_git_repositories( gitModulesFile )
 
-    release_data['date']    = release_date
-    release_data['version'] = date_tag
 
-    # Only push the new tag, if it is not created yet.
-    if release_data['git_tag'] != git_tag:
-        command = "git push origin %s" % git_tag
-        command_line_interface.execute( shlex.split( command ), absolute_path, live_output=True, short_errors=True )
+def create_repositories_list(gitRepositories, all_packages, last_channel_file, fingerprints=None, generation_journal=None):
+    """
+        @param gitRepositories    the list returned by load_git_repositories()
+        @param fingerprints       None to process all repositories, or a dictionary to enable the
+                                  incremental generation, which is filled with the new fingerprints
+        @param generation_journal None, or a `GenerationJournal` where the processed repositories
+                                  entries are saved, and from where the interrupted runs are resumed
+    """
+    repositories = []
+    dependencies = []
 
-    # Check this to do not erase the tagged branch
-    if 'is_branched_tag' not in release_data:
-        release_data['url'] = release_data['url'].replace( release_data['git_tag'], git_tag )
+    sections_count  = len( gitRepositories )
+    maximum_workers = get_maximum_workers()
 
-        if release_data['git_tag'] != git_tag:
-            release_data['git_tag'] = git_tag
+    index = 0
+    log( 1, "Total repositories to parse: %s (%s workers)", sections_count, maximum_workers )
 
+    if fingerprints is None:
+        last_fingerprints = None
 
-def print_failed_repositories():
+    else:
+        last_fingerprints = load_fingerprints_file()
 
-    if len( g_failed_repositories ) > 0:
-        log.newline( count=2 )
-        log( 1, "The following repositories failed their commands..." )
+    def process(repository):
 
-    for command, repository in g_failed_repositories:
-        log( 1, "Command: %s (%s)" % ( command, repository ) )
+        if generation_journal is not None:
+            # The entries also depend on the repository files and the default channel information,
+            # then they are only resumed when all of them are the same
+            repository.fingerprint = repository.getFingerprint( all_packages )
+            record = generation_journal.get( repository.section, repository.fingerprint )
 
+            if record:
+                log( 1, "Resuming the journaled repository entry... %s", repository.name )
+                repository.is_resumed = True
+
+                return record['repositories'], record['dependencies']
+
+        return process_repository( repository, all_packages, last_channel_file, last_fingerprints )
+
+    # The results are merged on the `.gitmodules` order, then the output is the same as the serial run
+    processed_repositories = run_in_order( process, gitRepositories, maximum_workers )
 
-@contextlib.contextmanager
-def lock_context_manager():
-    """
-        https://stackoverflow.com/questions/12594148/skipping-execution-of-with-block
-        https://stackoverflow.com/questions/27071524/python-context-manager-not-cleaning-up
-        https://stackoverflow.com/questions/10447818/python-context-manager-conditionally-executing-body
-        https://stackoverflow.com/questions/34775099/why-does-contextmanager-throws-a-runtime-error-generator-didnt-stop-after-thro
-    """
     try:
-        yield is_allowed_to_run()
 
-    finally:
-        free_mutex_lock()
+        for repository, pi in sequence_timer( gitRepositories, info_frequency=0 ):
 
+            if not g_is_already_running:
+                raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
 
-def free_mutex_lock():
-    global g_is_already_running
-    g_is_already_running = False
+            # # For quick testing
+            # if index > 3:
+            #     break
 
+            index += 1
 
-def is_allowed_to_run():
-    """
-        Returns `True` when it is allowed to run the channel manager, `False` otherwise.
-    """
-    global g_is_already_running
+            progress = progress_info( pi, set_progress )
+            log( 1, "{:s} Processing {:3d} of {:d} repositories... {:s}".format( progress, index, sections_count, repository.path ) )
 
-    if g_is_already_running:
-        print( "You are already running a command. Wait until it finishes or restart Sublime Text" )
-        return False
+            repository_entries, dependency_entries = next( processed_repositories )
+            repositories.extend( repository_entries )
+            dependencies.extend( dependency_entries )
 
-    g_is_already_running = True
-    return True
+            # The repositories which had some command failing are processed again when resuming
+            if generation_journal is not None and not is_failed_repository( repository.absolute_path ):
+                generation_journal.record( repository.section, repository.fingerprint, repository_entries,
+                        dependency_entries )
 
+    finally:
+        processed_repositories.close()
 
-def load_deafault_channel():
-    package_manager  = PackageManager()
-    channel_provider = ChannelProvider( g_channelSettings['DEFAULT_CHANNEL_URL'], package_manager.settings )
+        if generation_journal is not None:
+            generation_journal.close()
 
-    all_packages = {}
-    channel_repositories = channel_provider.get_sources()
+    if generation_journal is not None:
+        log( 1, "Resumed %s journaled repositories of %s.", sum( repository.is_resumed for repository in gitRepositories ),
+                len( gitRepositories ) )
 
-    for repository in channel_repositories:
-        packages = channel_provider.get_packages(repository)
-        all_packages.update( packages )
+    if fingerprints is not None:
+        save_repositories_fingerprints( gitRepositories, fingerprints )
 
-    return all_packages
+    return sort_list_of_dictionaries( repositories ), sort_list_of_dictionaries( dependencies )
 
 
-def create_repository_file(repositories, dependencies):
-    repository_file = OrderedDict()
-    repository_file['schema_version'] = "3.0.0"
+def open_generation_journal():
+    """
+        The `CHANNEL_CHECKPOINT_INTERVAL` setting defines after how many seconds the processed
+        repositories entries are saved on the `CHANNEL_GENERATION_JOURNAL_FILE`, then an interrupted
+        `all` command can be resumed by the next one. Negative values disable the journal.
 
-    repository_file['packages']     = repositories
-    repository_file['dependencies'] = dependencies
+        @return a `GenerationJournal`, or None when it is disabled
+    """
+    checkpoint_interval = g_channelSettings.get( 'CHANNEL_CHECKPOINT_INTERVAL', 30 )
 
-    # print_data_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'] )
-    write_data_file( g_channelSettings['CHANNEL_REPOSITORY_FILE'], repository_file )
+    try:
+        checkpoint_interval = float( checkpoint_interval )
 
+    except ( TypeError, ValueError ):
+        log( 1, "Warning: Invalid CHANNEL_CHECKPOINT_INTERVAL setting `%s`, using 30 seconds.", checkpoint_interval )
+        checkpoint_interval = 30
 
-def create_channel_file(repositories, dependencies):
-    channel_dictionary = OrderedDict()
+    if checkpoint_interval < 0:
+        return None
 
-    channel_dictionary['repositories'] = []
-    channel_dictionary['repositories'].append( g_channelSettings['CHANNEL_REPOSITORY_URL'] )
+    # The journal is only resumed when the `.gitmodules` file and the settings are the same
+    gitmodules_path = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], '.gitmodules' )
+    journal_key = get_journal_key( gitmodules_path, g_channelSettings )
 
-    channel_dictionary['schema_version'] = "3.0.0"
-    channel_dictionary['packages_cache'] = OrderedDict()
-    channel_dictionary['packages_cache'][g_channelSettings['CHANNEL_REPOSITORY_URL']] = repositories
+    return GenerationJournal( CHANNEL_GENERATION_JOURNAL_FILE, journal_key, checkpoint_interval )
 
-    channel_dictionary['dependencies_cache'] = OrderedDict()
-    channel_dictionary['dependencies_cache'][g_channelSettings['CHANNEL_REPOSITORY_URL']] = dependencies
 
-    # print_data_file( g_channelSettings['CHANNEL_FILE_PATH'] )
-    write_data_file( g_channelSettings['CHANNEL_FILE_PATH'], channel_dictionary )
+def save_repositories_fingerprints(gitRepositories, fingerprints):
+    """
+        Repositories which had some command failing are not saved, then they are processed again on
+        the next run, instead of reusing an entry which can be wrong.
+    """
+    reused_count = 0
 
+    with g_failed_repositories_lock:
+        failed_paths = set( absolute_path for command, absolute_path in g_failed_repositories )
 
-def create_repositories_list(all_packages, last_channel_file):
-    gitFilePath    = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], '.gitmodules' )
-    gitModulesFile = configparser.RawConfigParser()
+    for repository in gitRepositories:
+
+        if repository.is_reused:
+            reused_count += 1
+
+        if repository.fingerprint and repository.absolute_path not in failed_paths:
+            fingerprints[repository.name] = repository.fingerprint
+
+    log( 1, "Reused %s unchanged repositories of %s.", reused_count, len( gitRepositories ) )
 
+
+def process_repository(repository, all_packages, last_channel_file, last_fingerprints=None):
+    """
+        Run the git pipeline for one `.gitmodules` section. This can be called by several worker
+        threads at the same time, hence it must not change anything shared between repositories.
+
+        @param last_fingerprints  None, or the last fingerprints to reuse the unchanged entries
+        @return a tuple with the `repositories` and `dependencies` entries created for `repository`
+    """
     repositories = []
     dependencies = []
 
-    gitModulesFile.read( gitFilePath )
-    command_line_interface = cmd.Cli( None, False )
+    if not g_is_already_running:
+        raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
 
-    gitRepositories = get_git_repositories( gitModulesFile )
-    sections_count  = len( gitRepositories )
+    if last_fingerprints is not None:
 
-    index = 0
-    log( 1, "gitModulesFile: %s", gitFilePath )
-    log( 1, "Total repositories to parse: " + str( sections_count ) )
+        # It was already computed when the generation journal is enabled
+        if repository.fingerprint is None:
+            repository.fingerprint = repository.getFingerprint( all_packages )
 
-    for repository, pi in sequence_timer( gitRepositories, info_frequency=0 ):
+        last_entry = last_channel_file.get( repository.name )
 
-        if not g_is_already_running:
-            raise RuntimeError( "Stopping the process as this Python module was reloaded!" )
+        if last_entry and repository.fingerprint \
+                and last_fingerprints.get( repository.name ) == repository.fingerprint:
 
-        # # For quick testing
-        # if index > 3:
-        #     break
+            log( 1, "Reusing the unchanged repository entry... %s", repository.name )
+            repository.is_reused = True
 
-        index += 1
+            if "load_order" in last_entry:
+                dependencies.append( last_entry )
 
-        progress = progress_info( pi, set_progress )
-        log( 1, "{:s} Processing {:3d} of {:d} repositories... {:s}".format( progress, index, sections_count, repository.path ) )
+            else:
+                repositories.append( last_entry )
 
-        if repository.name in all_packages:
-            repository.info = all_packages[repository.name]
+            return repositories, dependencies
 
-        else:
-            repository.info['details'] = repository.url
+    command_line_interface = get_command_line_interface()
 
-        repository.release_data['platforms']    = "*"
-        repository.release_data['sublime_text'] = ">=3126"
+    if repository.name in all_packages:
+        repository.info = all_packages[repository.name]
 
-        # Must to be called after setting `release_data{}`
-        repository.setVersioningTag( last_channel_file, command_line_interface )
-        fix_sublime_text_release( repository, repositories, dependencies )
+    else:
+        repository.info['details'] = repository.url
 
-        user_forker = get_user_name( repository.url )
-        repository.ensureAuthorName( user_forker )
+    repository.release_data['platforms']    = "*"
+    repository.release_data['sublime_text'] = ">=3126"
 
-        # Must to be called after `setVersioningTag()`
-        tagged_releases = repository.getOldCompatibleVersions( command_line_interface )
-        tagged_releases.insert( 0, repository.release_data )
-        tagged_releases = sort_dictionaries_on_list( tagged_releases )
+    # Must to be called after setting `release_data{}`
+    repository.setVersioningTag( last_channel_file, command_line_interface )
+    fix_sublime_text_release( repository, repositories, dependencies )
 
-        repository.info['name']     = repository.name
-        repository.info['releases'] = tagged_releases
+    user_forker = get_user_name( repository.url )
+    repository.ensureAuthorName( user_forker )
 
-    return sort_list_of_dictionaries( repositories ), sort_list_of_dictionaries( dependencies )
+    # Must to be called after `setVersioningTag()`
+    tagged_releases = repository.getOldCompatibleVersions( command_line_interface )
+    tagged_releases.insert( 0, repository.release_data )
+    tagged_releases = sort_dictionaries_on_list( tagged_releases )
 
+    repository.info['name']     = repository.name
+    repository.info['releases'] = tagged_releases
 
-def get_last_tag_fixed(absolute_path, last_dictionary, command_line_interface, force_tag_update=False, severity_level=1):
+    return repositories, dependencies
+
+
+def get_last_tag_fixed(absolute_path, last_dictionary, command_line_interface, force_tag_update=False, severity_level=1,
+            pushed_refspecs=None, tag_plan=None):
     """
         This is a entry point to do some batch operation on each git submodule. We can temporarily
         insert the code we want to run with `command_line_interface` and remove later.
 
         @param severity_level   4 - Do nothing, 3 - Increments Patch, 2 - Minor, 1 - Major, or a git tag as "2.5.8"
         @param force_tag_update if True, the tag will be created and also push the created tag to origin.
+        @param pushed_refspecs  see the function delete_tags_list()
+        @param tag_plan         None to change the repository tags, or a `RepositoryTagPlan` to only
+                                record the changes which would be done
     """
     git_tag = get_git_latest_tag( absolute_path, command_line_interface )
 
+    if tag_plan is not None:
+        tag_plan.head       = get_git_head( absolute_path, command_line_interface )
+        tag_plan.latest_tag = git_tag
+
     # # Delete all local tags not present on the remote
     # # https://stackoverflow.com/questions/1841341/remove-local-tags-that-are-no-longer
     # command = shlex.split( 'git fetch --prune origin "+refs/tags/*:refs/tags/*"' )
@@ -556,7 +1739,7 @@ def get_last_tag_fixed(absolute_path, last_dictionary, command_line_interface, f
 
             if "master" == git_tag:
 
-                if create_git_tag( absolute_path, "1.0.0", command_line_interface ):
+                if create_git_tag( absolute_path, "1.0.0", command_line_interface, tag_plan ):
                     git_tag = "1.0.0"
 
             # if LooseVersion( date_tag ) > LooseVersion( last_date_tag ):
@@ -564,6 +1747,10 @@ def get_last_tag_fixed(absolute_path, last_dictionary, command_line_interface, f
                 next_git_tag, is_incremented, unprefixed_tag = increment_tag_version( git_tag, force_tag_update, severity_level )
                 current_tags = get_current_commit_tags( absolute_path, command_line_interface )
 
+                # The planned tags were not created, but they would be pointing at HEAD
+                if tag_plan is not None:
+                    current_tags = "\n".join( tag_plan.get_head_tags( current_tags.split( "\n" ) if current_tags else [] ) )
+
                 if len( current_tags ) > 0:
                     tags_list = current_tags.split( "\n" )
                     log( 1, "The current HEAD commit already has the following tags(s): %s" % str( current_tags ) )
@@ -573,10 +1760,10 @@ def get_last_tag_fixed(absolute_path, last_dictionary, command_line_interface, f
                     # platforms as Linux and Windows. Then we create a unified tag which is based
                     # on the current master branch.
                     if next_git_tag != unprefixed_tag or len( tags_list ) > 1:
-                        delete_tags_list( absolute_path, tags_list, command_line_interface )
+                        delete_tags_list( absolute_path, tags_list, command_line_interface, pushed_refspecs, tag_plan )
 
                         # We will skip the current tag and create the next available
-                        if create_git_tag( absolute_path, unprefixed_tag, command_line_interface ):
+                        if create_git_tag( absolute_path, unprefixed_tag, command_line_interface, tag_plan ):
                             git_tag = unprefixed_tag
                             log.newline()
 
@@ -584,53 +1771,195 @@ def get_last_tag_fixed(absolute_path, last_dictionary, command_line_interface, f
 
                     if next_git_tag != unprefixed_tag:
 
-                        if create_git_tag( absolute_path, unprefixed_tag, command_line_interface ):
+                        if create_git_tag( absolute_path, unprefixed_tag, command_line_interface, tag_plan ):
                             git_tag = unprefixed_tag
 
                     else:
 
                         if is_incremented:
 
-                            if create_git_tag( absolute_path, next_git_tag, command_line_interface ):
+                            if create_git_tag( absolute_path, next_git_tag, command_line_interface, tag_plan ):
                                 git_tag = next_git_tag
 
                         else:
                             log( 1, "Error: The tag `%s` could not be incremented for the package: %s" % ( next_git_tag, absolute_path ) )
-                            g_failed_repositories.append( ("", absolute_path) )
+                            add_failed_repository( "", absolute_path )
 
-    release_date = get_git_tag_date( absolute_path, command_line_interface, git_tag )
+    if tag_plan is not None and git_tag in tag_plan.get_created_tags():
+        release_date = get_git_head_date( absolute_path, command_line_interface )
+
+    else:
+        release_date = get_git_tag_date( absolute_path, command_line_interface, git_tag )
     date_tag     = get_git_version( release_date )
 
     return git_tag, date_tag, release_date
 
 
-def delete_tags_list(absolute_path, tags_list, command_line_interface):
-    tags_count   = len( tags_list )
-    remote_index = 0
+def delete_tags_list(absolute_path, tags_list, command_line_interface, pushed_refspecs=None, tag_plan=None):
+    """
+        Delete all the `tags_list` with one `git tag -d` call, and from the origin remote with one
+        `git push` call.
+
+        @param pushed_refspecs None to delete the remote tags now, or a list where the remote tags
+                               deletions are appended, to push them later with push_git_refspecs()
+                               together with the other repository tags
+        @param tag_plan        see the function get_last_tag_fixed()
+    """
+    deleted_refspecs = [ ":refs/tags/%s" % tag for tag in tags_list ]
+
+    if tag_plan is not None:
+        log( 1, "Planning to clean {:d} tags of {:s}: {:s}".format( len( tags_list ), os.path.basename( absolute_path ), " ".join( tags_list ) ) )
+        tag_plan.delete_tags( tags_list )
+
+        if pushed_refspecs is not None:
+            pushed_refspecs.extend( deleted_refspecs )
+
+        return
+
+    log( 1, "Cleaning {:d} tags of {:s}: {:s}".format( len( tags_list ), os.path.basename( absolute_path ), " ".join( tags_list ) ) )
+
+    command_line_interface.execute(
+        [ "git", "tag", "-d" ] + tags_list,
+        absolute_path,
+        live_output=True,
+        short_errors=True
+    )
+
+    clear_git_tags_tables( absolute_path )
+
+    if pushed_refspecs is None:
+        push_git_refspecs( absolute_path, deleted_refspecs, command_line_interface )
+
+    else:
+        pushed_refspecs.extend( deleted_refspecs )
+
+
+def push_git_refspecs(absolute_path, refspecs, command_line_interface):
+    """
+        Push all the `refspecs` to the origin remote with one `git push --atomic` call, then either
+        all of them are updated on the remote, or none. When the atomic push is rejected, as when
+        the remote does not support it or one tag already exists there, they are pushed again
+        without `--atomic`, then the other refspecs are still updated, as when each one was pushed
+        by its own `git push` call.
+
+        @return True when all the refspecs were pushed
+    """
+
+    if not refspecs:
+        return True
+
+    command = [ "git", "push", "--atomic", "origin" ] + refspecs
+    output  = command_line_interface.execute( command, absolute_path, live_output=True, short_errors=True )
+
+    if output is False:
+        log( 1, "Warning: The atomic push was rejected for the package `%s`, pushing without `--atomic`: %s", absolute_path, refspecs )
+
+        command = [ "git", "push", "origin" ] + refspecs
+        output  = command_line_interface.execute( command, absolute_path, live_output=True, short_errors=True )
+
+        if output is False:
+            add_failed_repository( command, absolute_path )
+            return False
+
+    return True
+
+
+def get_git_tags_table(absolute_path, command_line_interface):
+    """
+        Read all the repository tags with one git command and keep them until the next run, or until
+        the repository tags are changed by create_git_tag() or delete_tags_list().
+
+        @return a `GitTagsTable`, or None when the tags could not be read
+    """
+
+    with g_git_tags_tables_lock:
+
+        if absolute_path in g_git_tags_tables:
+            return g_git_tags_tables[absolute_path]
+
+    git_tags_table = None
+
+    if is_git_files_reader_enabled():
+        git_tags_table = read_git_tags_table_from_files( absolute_path, command_line_interface,
+                get_git_object_server( absolute_path ) )
+
+    if git_tags_table is None:
+        git_tags_table = read_git_tags_table( absolute_path, command_line_interface )
+
+    with g_git_tags_tables_lock:
+        g_git_tags_tables[absolute_path] = git_tags_table
+
+    return git_tags_table
+
+
+def is_git_files_reader_enabled():
+    """
+        The `CHANNEL_GIT_FILES_READER` setting allows to disable reading the repositories references
+        and loose objects directly from their git directory, then git is always run to read them.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_GIT_FILES_READER', True ) )
+
+
+def is_skip_unchanged_repositories():
+    """
+        The `CHANNEL_SKIP_UNCHANGED_REPOSITORIES` setting allows to disable skipping the repositories
+        without changes since their latest tag, then the `git_tag_all` command tags all of them.
+    """
+    return bool( g_channelSettings.get( 'CHANNEL_SKIP_UNCHANGED_REPOSITORIES', True ) )
 
-    for tag, pi in sequence_timer( tags_list, info_frequency=0 ):
-        remote_index += 1
 
-        progress = progress_info( pi )
-        log( 1, "Cleaning tag {:3d} of {:d} ({:s}): {:<20s} {:s}".format(
-                remote_index, tags_count, progress, tag, os.path.basename( absolute_path ) ) )
+def get_git_object_server(absolute_path):
+    """
+        The `CHANNEL_MAXIMUM_GIT_OBJECT_SERVERS` setting defines how many `git cat-file --batch`
+        processes can be opened at the same time, to read the packed git objects. Values lower than
+        1 disable them.
+
+        @return a function to read the `absolute_path` repository objects, or None when disabled
+    """
+    maximum_servers = g_channelSettings.get( 'CHANNEL_MAXIMUM_GIT_OBJECT_SERVERS', 4 )
+
+    try:
+        maximum_servers = int( maximum_servers )
+
+    except ( TypeError, ValueError ):
+        log( 1, "Warning: Invalid CHANNEL_MAXIMUM_GIT_OBJECT_SERVERS setting `%s`, disabling them.", maximum_servers )
+        maximum_servers = 0
+
+    if maximum_servers < 1:
+        return None
+
+    def read_object(revision):
+        return get_git_object_servers().read_object( absolute_path, revision, maximum_servers )
 
-        command_line_interface.execute(
-            shlex.split( "git tag -d %s" % ( tag ) ),
-            absolute_path,
-            live_output=True,
-            short_errors=True
-        )
+    return read_object
+
+
+def clear_git_tags_tables(absolute_path=None):
+    """
+        @param absolute_path the repository to forget its tags, or None to forget all repositories
+    """
+
+    with g_git_tags_tables_lock:
+
+        if absolute_path is None:
+            g_git_tags_tables.clear()
+
+        else:
+            g_git_tags_tables.pop( absolute_path, None )
 
-        command_line_interface.execute(
-            shlex.split( "git push origin :refs/tags/%s" % ( tag ) ),
-            absolute_path,
-            live_output=True,
-            short_errors=True
-        )
+    # The new tags objects are only read by a new git object server
+    get_git_object_servers().close( absolute_path )
 
 
 def get_current_commit_tags(absolute_path, command_line_interface):
+    git_tags_table = get_git_tags_table( absolute_path, command_line_interface )
+
+    if git_tags_table is not None:
+        head = git_tags_table.get_head( command_line_interface )
+
+        if head:
+            return "\n".join( git_tags_table.get_tags_pointing_at( head ) )
+
     command = shlex.split( "git tag -l --points-at HEAD" )
     output = command_line_interface.execute( command, absolute_path, short_errors=True )
 
@@ -679,24 +2008,11 @@ def increment_tag_version(git_tag, force_tag_update=False, severity_level=1):
     except ValueError:
         pass
 
-    fixed_tag, matched_tag = fix_semantic_version( git_tag )
-    matches = re.search( r"(\d+)\.(\d+)\.(\d+)", fixed_tag )
-
-    def determine_update_level(group):
-
-        if severity_level == group:
-            return str( int( matches.group( group ) ) + 1 )
-
-        else:
-
-            if severity_level < group:
-                return "0"
+    parsed_tag = ParsedTag.parse( git_tag )
 
-            return matches.group( group )
-
-    if matches:
-        fixed_tag = "%s.%s.%s" % ( determine_update_level(1), determine_update_level(2), determine_update_level(3) )
-        return git_tag.replace( matched_tag, fixed_tag ), True, fixed_tag
+    if parsed_tag.numbers:
+        fixed_tag = parsed_tag.increment( severity_level )
+        return git_tag.replace( parsed_tag.matched, fixed_tag ), True, fixed_tag
 
     log( 1, "Warning: Could not increment the git_tag: " + str( git_tag ) )
 
@@ -735,7 +2051,7 @@ def fix_sublime_text_release(repository, repositories, dependencies):
 
 
 def get_version_number(sublime_version_text):
-    number_match = re.match('.+(\d+)$',  sublime_version_text)
+    number_match = VERSION_NUMBER_REGEX.match( sublime_version_text )
 
     if number_match:
         return int( number_match.group( 1 ) )
@@ -752,35 +2068,12 @@ def is_compatible_version(release_version, acceptable_version):
     if release_version == '*':
         return True
 
-    min_version = float("-inf")
-    max_version = float("inf")
-
-    range_match      = re.match('(\d+)\s*-\s*(\d+)$', release_version)
-    less_than        = re.match('<(\d+)$',  release_version)
-    greater_than     = re.match('>(\d+)$',  release_version)
-    less_or_equal    = re.match('<=(\d+)$', release_version)
-    greater_or_equal = re.match('>=(\d+)$', release_version)
-
-    if greater_than:
-        min_version = int( greater_than.group( 1 ) ) + 1
-
-    elif greater_or_equal:
-        min_version = int( greater_or_equal.group( 1 ) )
-
-    elif less_than:
-        max_version = int( less_than.group( 1 ) ) - 1
-
-    elif less_or_equal:
-        max_version = int( less_or_equal.group( 1 ) )
-
-    elif range_match:
-        min_version = int( range_match.group( 1 ) )
-        max_version = int( range_match.group( 2 ) )
+    version_range = VersionRange.parse( release_version )
 
-    else:
+    if not version_range:
         return False
 
-    if min_version < acceptable_version or max_version < acceptable_version:
+    if version_range.min_build < acceptable_version or version_range.max_build < acceptable_version:
         return False
 
     return True
@@ -815,14 +2108,10 @@ def fix_semantic_version(tag):
     """
         Returns a git tag on the format `0.0.0`.
     """
-    regexes = [ ("(\d+)", ".0.0"), ("(\d+\.\d+)", ".0"), ("(\d+\.\d+\.\d+)", "") ]
-
-    for expression, complement in reversed( regexes ):
-        matches = re.search( expression, tag )
+    parsed_tag = ParsedTag.parse( tag )
 
-        if matches:
-            matched_text = tag[matches.start(0):matches.end(0)]
-            return matches.group(0) + complement, matched_text
+    if parsed_tag.numbers:
+        return parsed_tag.semantic_version, parsed_tag.matched
 
     return tag, tag
 
@@ -838,12 +2127,25 @@ def get_git_commit_date(absolute_path, command_line_interface):
     output  = command_line_interface.execute( command, absolute_path, short_errors=True )
 
     if output is False:
-        g_failed_repositories.append( (command, absolute_path) )
+        add_failed_repository( command, absolute_path )
         return "2017-04-13 16:44:14"
 
     return output[0:19]
 
 
+def get_channel_git_metadata_cache():
+    """
+        The `CHANNEL_GIT_METADATA_CACHE` setting allows to disable the persistent git metadata cache.
+
+        @return the `GitMetadataCache`, or None when it is disabled or not available
+    """
+
+    if g_channelSettings.get( 'CHANNEL_GIT_METADATA_CACHE', True ):
+        return get_git_metadata_cache()
+
+    return None
+
+
 def get_git_tag_date(absolute_path, command_line_interface, tag):
     """
         Get timestamp of the specified tag in git repository
@@ -851,12 +2153,85 @@ def get_git_tag_date(absolute_path, command_line_interface, tag):
 
         @return release_date `2018-02-16 01:40:11`
     """
+    git_metadata_cache = get_channel_git_metadata_cache()
+
+    if git_metadata_cache:
+        reference, object_id = resolve_git_reference( read_git_references( absolute_path ), tag )
+
+        if object_id:
+            cached_metadata = git_metadata_cache.get( absolute_path, reference, object_id )
+
+            if cached_metadata and cached_metadata['date']:
+                return cached_metadata['date']
+
+            release_date = _get_git_tag_date( absolute_path, command_line_interface, tag )
+            git_metadata_cache.set( absolute_path, reference, object_id, date=release_date, version=get_git_version( release_date ) )
+
+            return release_date
+
+    return _get_git_tag_date( absolute_path, command_line_interface, tag )
+
+
+def get_git_tag_release(absolute_path, command_line_interface, tag, url):
+    """
+        Create the release dictionary for the Sublime Text build `tag` as `3143`.
+
+        @return the release dictionary, see Repository.getOldCompatibleVersions()
+    """
+    git_metadata_cache = get_channel_git_metadata_cache()
+    download_url       = get_download_url( url, tag )
+
+    reference, object_id = None, None
+
+    if git_metadata_cache:
+        reference, object_id = resolve_git_reference( read_git_references( absolute_path ), tag )
+
+        if object_id:
+            cached_metadata = git_metadata_cache.get( absolute_path, reference, object_id )
+
+            if cached_metadata and cached_metadata['release'] \
+                    and cached_metadata['release'].get( 'url' ) == download_url:
+
+                return cached_metadata['release']
+
+    tag_date     = get_git_tag_date( absolute_path, command_line_interface, tag )
+    release_data = OrderedDict()
+
+    release_data['platforms']    = "*"
+    release_data['sublime_text'] = "<=%s" % tag
+
+    release_data['url']     = download_url
+    release_data['date']    = tag_date
+    release_data['version'] = get_git_version( tag_date )
+
+    if object_id:
+        git_metadata_cache.set( absolute_path, reference, object_id, release=release_data )
+
+    return release_data
+
+
+def _get_git_tag_date(absolute_path, command_line_interface, tag):
+    git_tags_table = get_git_tags_table( absolute_path, command_line_interface )
+
+    if git_tags_table is not None:
+        release_date = git_tags_table.get_tag_date( tag )
+
+        if release_date:
+            return release_date
+
+        if git_tags_table.reader is not None:
+            release_date = git_tags_table.reader.read_branch_date( tag )
+
+            if release_date:
+                return release_date[0:19]
+
+    # The `tag` can also be a branch name as `master`, which is not on the tags table
     # command = shlex.split( "git log -1 --date=iso" )
     command = shlex.split( "git log -1 --pretty=format:%ci {}".format( tag ) )
     output  = command_line_interface.execute( command, absolute_path, short_errors=True )
 
     if output is False:
-        g_failed_repositories.append( (command, absolute_path) )
+        add_failed_repository( command, absolute_path )
         raise ValueError("Git could not find the last git tag date!")
 
     return output[0:19]
@@ -876,29 +2251,36 @@ def get_git_latest_tag(absolute_path, command_line_interface):
         How to sort git tags by version string order of form rc-X.Y.Z.W?
         https://stackoverflow.com/questions/14273531/how-to-sort-git-tags-by-version-string-order-of-form-rc-x-y-z-w/22634649#22634649
     """
-    # command = shlex.split( "git log -1 --date=iso" )
-    command = shlex.split( "git tag --sort=-creatordate --sort=version:refname" )
+    git_metadata_cache     = get_channel_git_metadata_cache()
+    references_fingerprint = None
 
-    git_tags  = command_line_interface.execute( command, absolute_path, short_errors=True )
-    clean_tag = "master"
+    # The latest tag is cached with the fingerprint of all the repository references
+    if git_metadata_cache:
+        references_fingerprint = get_git_references_fingerprint( absolute_path )
 
-    if git_tags is False \
-            or "warning:" in git_tags \
-            or len( git_tags ) < 3:
+        if references_fingerprint:
+            cached_metadata = git_metadata_cache.get( absolute_path, "refs/tags", references_fingerprint )
 
-        log( 1, "Error: Failed getting git tag for the package `%s`, results: %s" % ( absolute_path, git_tags ) )
-        g_failed_repositories.append( (command, absolute_path) )
+            if cached_metadata and cached_metadata['version']:
+                return cached_metadata['version']
 
-        return clean_tag
+    git_tags_table = get_git_tags_table( absolute_path, command_line_interface )
+    clean_tag      = "master"
+
+    if not git_tags_table:
+        log( 1, "Error: Failed getting git tag for the package `%s`, results: %s" % ( absolute_path, git_tags_table and git_tags_table.names() ) )
+        add_failed_repository( GIT_TAGS_COMMAND, absolute_path )
 
-    git_tags  = git_tags.split( "\n" )
-    clean_tag = git_tags[-1]
+        return clean_tag
 
-    # Takes the latest tag which is numeric on the form `0.0anything` (number.number)
-    for index, git_tag in enumerate( git_tags ):
+    # The tags are sorted as `git tag --sort=-creatordate --sort=version:refname`, and the latest
+    # tag which is numeric on the form `0.0anything` (number.number) is taken
+    clean_tag = get_latest_numeric_tag( git_tags_table.names() )
 
-        if re.search( "^(\d+)\.(\d+)(.+)?$", git_tag ):
-            clean_tag = git_tag
+    # The references changed since the last run, then forget the ones which do not exist anymore
+    if references_fingerprint:
+        git_metadata_cache.evict( absolute_path, get_git_cache_references( absolute_path ) )
+        git_metadata_cache.set( absolute_path, "refs/tags", references_fingerprint, version=clean_tag )
 
     return clean_tag
 
@@ -933,16 +2315,25 @@ def create_packages_manager_tag(absolute_path, command_line_interface):
         command_line_interface.execute( shlex.split( command ), absolute_path, live_output=True, short_errors=True )
 
 
-def create_git_tag(absolute_path, new_tag_name, command_line_interface):
+def create_git_tag(absolute_path, new_tag_name, command_line_interface, tag_plan=None):
+    """
+        @param tag_plan see the function get_last_tag_fixed()
+    """
+
+    if tag_plan is not None:
+        log( 1, "Planning the git tag `%s` for the package `%s`" % ( new_tag_name, absolute_path ) )
+        return tag_plan.create_tag( new_tag_name )
+
     create_packages_manager_tag( absolute_path, command_line_interface )
 
     command = shlex.split( "git tag %s" % new_tag_name )
     output = command_line_interface.execute( command, absolute_path, short_errors=True )
+    clear_git_tags_tables( absolute_path )
 
     if output is False:
         log( 1, "Error: Failed creating git tag `%s` for the package `%s`, results: %s" % ( new_tag_name, absolute_path, output ) )
 
-        g_failed_repositories.append( (command, absolute_path) )
+        add_failed_repository( command, absolute_path )
         return False
 
     log( 1, "Creating git tag `%s` for the package `%s`, results: %s" % ( new_tag_name, absolute_path, output ) )
@@ -1045,6 +2436,13 @@ class Repository():
         # absolute path the the repository
         self.absolute_path = os.path.join( g_channelSettings['CHANNEL_ROOT_DIRECTORY'], self.path )
 
+        # used by the incremental generation, see the function getFingerprint()
+        self.fingerprint = None
+        self.is_reused   = False
+
+        # used by the generation journal, see the function create_repositories_list()
+        self.is_resumed = False
+
         # the dictionary with the current  information
         self._setDependenciesList()
         self._loadSettingsFile()
@@ -1081,6 +2479,33 @@ class Repository():
             except Exception:
                 log.exception( "Could not process: %s", repository_settings_path )
 
+    def getFingerprint(self, all_packages):
+        """
+            Hash everything which is used to create this repository entry: its HEAD commit and tags,
+            its `.gitmodules` section, its `settings.json` and `.sublime-dependency` files and the
+            default channel information about the package.
+
+            @return a hexadecimal digest, or None when the repository git directory was not found
+        """
+        references_fingerprint = get_git_references_fingerprint( self.absolute_path )
+
+        if references_fingerprint is None:
+            return None
+
+        hasher = hashlib.sha1()
+
+        for value in ( FINGERPRINTS_VERSION, references_fingerprint, self.url, self.upstream, self.path ):
+            hasher.update( ( "%s\n" % value ).encode( 'utf-8' ) )
+
+        for file_name in ( "settings.json", ".sublime-dependency" ):
+            contents = read_binary_file( os.path.join( self.absolute_path, file_name ) )
+            hasher.update( b"\0" if contents is None else contents + b"\n" )
+
+        package_information = json.dumps( all_packages.get( self.name ), sort_keys=True, default=str )
+        hasher.update( package_information.encode( 'utf-8' ) )
+
+        return hasher.hexdigest()
+
     def getSupposedUrl(self):
         return get_download_url( self.url, self.release_data['git_tag'] )
 
@@ -1170,24 +2595,16 @@ class Repository():
 
                 try:
                     tag_interger = int( tag )
-                    tag_date     = get_git_tag_date( self.absolute_path, command_line_interface, tag )
+                    release_data = get_git_tag_release( self.absolute_path, command_line_interface, tag, self.url )
 
                 except ValueError as error:
                     log( 1, "Warning: Skipping tag... %s" % error )
                     continue
 
-                release_data = OrderedDict()
-                release_data['platforms']    = "*"
-                release_data['sublime_text'] = "<=%s" % tag
-
                 if greatest_tag < tag_interger:
                     greatest_tag = tag_interger
                     self.release_data['sublime_text'] = ">" + tag
 
-                release_data['url']     = get_download_url( self.url, tag )
-                release_data['date']    = tag_date
-                release_data['version'] = get_git_version( tag_date )
-
                 tagged_releases.append( release_data )
 
         return tagged_releases
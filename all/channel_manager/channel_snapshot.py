@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Snapshot, keep a local copy of the default channel between runs
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import time
+import gzip
+import zlib
+
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from . import settings as g_settings
+    from .channel_writer import atomic_file_writer
+
+except( ImportError, ValueError ):
+    import settings as g_settings
+    from channel_writer import atomic_file_writer
+
+
+from debug_tools import getLogger
+from debug_tools.third_part import load_data_file
+from debug_tools.third_part import write_data_file
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# Saved on the same folder as the `last_session.json` file
+DEFAULT_CHANNEL_SNAPSHOT_FILE = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "all", "default_channel.json.gz" )
+
+# The snapshot url, validators and download time are saved on this file
+DEFAULT_CHANNEL_SNAPSHOT_METADATA_FILE = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "all", "default_channel.json" )
+
+# How many seconds to wait for the channel server
+DOWNLOAD_TIMEOUT = 60
+
+
+class ChannelSnapshot(object):
+    """
+        A gzip compressed copy of a channel file, with the `ETag` and `Last-Modified` headers sent
+        by the server, which are used to ask the server whether the channel changed, instead of
+        downloading it again.
+
+        The Package Control downloader does not return the `304 Not Modified` responses neither the
+        response headers, then the conditional requests are done with urllib, using the same proxies
+        as Package Control. When they fail, as when the certificate is not trusted by Python, the
+        channel is downloaded by the `fallback_download` function.
+    """
+
+    def __init__(self, url, snapshot_file=None, metadata_file=None, proxies=None):
+        self.url = url
+        self.proxies = proxies
+        self.snapshot_file = snapshot_file or DEFAULT_CHANNEL_SNAPSHOT_FILE
+        self.metadata_file = metadata_file or DEFAULT_CHANNEL_SNAPSHOT_METADATA_FILE
+
+    def get_contents(self, maximum_age, is_offline=False, fallback_download=None):
+        """
+            @param maximum_age       how many seconds the snapshot is used before asking the server
+                                     whether the channel changed
+            @param is_offline        if True, the server is never contacted, and an IOError is
+                                     raised when there is no snapshot
+            @param fallback_download None, or a function `(url)` returning the channel contents
+                                     when it could not be downloaded by urllib
+
+            @return the channel file contents as bytes
+        """
+        metadata = self.read_metadata()
+        contents = self.read_snapshot() if metadata else None
+
+        if contents is not None:
+            age = time.time() - metadata.get( 'timestamp', 0 )
+
+            if is_offline or 0 <= age < maximum_age:
+                log( 1, "Using the default channel snapshot from %d seconds ago: %s", age, self.snapshot_file )
+                return contents
+
+        elif is_offline:
+            raise IOError( "There is no snapshot of the default channel `%s` to use offline." % self.url )
+
+        try:
+            response = download_channel( self.url, metadata if contents is not None else {}, self.proxies )
+
+        except ( urllib.error.URLError, IOError, OSError, ValueError ) as error:
+            log( 1, "Warning: Could not download the default channel `%s`: %s", self.url, error )
+            response = None
+
+            if fallback_download:
+
+                try:
+                    response = { 'contents': fallback_download( self.url ) }
+
+                except Exception as error:
+                    log( 1, "Warning: Could not download the default channel `%s` again: %s", self.url, error )
+
+            if response is None:
+
+                if contents is None:
+                    raise IOError( "Could not download the default channel `%s`." % self.url )
+
+                log( 1, "Warning: Using the outdated default channel snapshot: %s", self.snapshot_file )
+                return contents
+
+        if response.get( 'contents' ) is None:
+            log( 1, "The default channel did not change, using its snapshot: %s", self.snapshot_file )
+
+        else:
+            contents = response['contents']
+            self.write_snapshot( contents )
+
+        self.write_metadata( response.get( 'etag' ), response.get( 'last_modified' ) )
+        return contents
+
+    def read_metadata(self):
+        """
+            @return the snapshot metadata dictionary, or None when it is not for this channel url
+        """
+
+        if not os.path.exists( self.metadata_file ):
+            return None
+
+        metadata = load_data_file( self.metadata_file )
+        return metadata if metadata.get( 'url' ) == self.url else None
+
+    def write_metadata(self, etag, last_modified):
+        metadata = {
+            'url': self.url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'timestamp': time.time(),
+        }
+
+        write_data_file( self.metadata_file, metadata )
+
+    def read_snapshot(self):
+        """
+            @return the snapshot contents, or None when it does not exist or it is corrupted
+        """
+
+        try:
+            with gzip.open( self.snapshot_file, 'rb' ) as snapshot_file:
+                return snapshot_file.read()
+
+        except ( IOError, OSError, EOFError, zlib.error ) as error:
+            log( 1, "Warning: Could not read the default channel snapshot `%s`: %s", self.snapshot_file, error )
+            return None
+
+    def write_snapshot(self, contents):
+
+        with atomic_file_writer( self.snapshot_file, 'wb' ) as snapshot_file:
+            snapshot_file.write( gzip.compress( contents ) )
+
+
+def get_proxies(settings):
+    """
+        @param settings the Package Control settings, with the `http_proxy`, `https_proxy`,
+                        `proxy_username` and `proxy_password` keys
+        @return a dictionary with the proxies for the urllib `ProxyHandler`, or None to use the
+                system proxies
+    """
+    proxies = {}
+
+    for scheme in ( 'http', 'https' ):
+        proxy = settings.get( scheme + '_proxy' )
+
+        if not proxy:
+            continue
+
+        if '://' not in proxy:
+            proxy = 'http://' + proxy
+
+        username = settings.get( 'proxy_username' )
+
+        if username and '@' not in proxy:
+            proxy_scheme, proxy_address = proxy.split( '://', 1 )
+            proxy = "%s://%s:%s@%s" % ( proxy_scheme, urllib.parse.quote( username, safe='' ),
+                    urllib.parse.quote( settings.get( 'proxy_password' ) or '', safe='' ), proxy_address )
+
+        proxies[scheme] = proxy
+
+    return proxies or None
+
+
+def download_channel(url, validators, proxies=None):
+    """
+        Download the channel file, or only ask whether it changed when there are `validators`.
+
+        @param validators a dictionary with the last `etag` and `last_modified` headers sent by the
+                          server for this url
+        @param proxies    None, or a dictionary with the proxies for the urllib `ProxyHandler`
+        @return a dictionary with the keys `contents`, which is None when the channel did not
+                change, `etag` and `last_modified`
+    """
+    request = urllib.request.Request( url, headers={ 'Accept-Encoding': 'gzip', 'User-Agent': 'ChannelManager' } )
+
+    if validators.get( 'etag' ):
+        request.add_header( 'If-None-Match', validators['etag'] )
+
+    if validators.get( 'last_modified' ):
+        request.add_header( 'If-Modified-Since', validators['last_modified'] )
+
+    open_url = urllib.request.build_opener( urllib.request.ProxyHandler( proxies ) ).open if proxies else urllib.request.urlopen
+
+    try:
+        with open_url( request, timeout=DOWNLOAD_TIMEOUT ) as response:
+            contents = response.read()
+            headers  = response.headers
+
+    except urllib.error.HTTPError as error:
+
+        if error.code != 304:
+            raise
+
+        # The server may not send the validators again with the `304 Not Modified` response
+        return {
+            'contents': None,
+            'etag': error.headers.get( 'ETag' ) or validators.get( 'etag' ),
+            'last_modified': error.headers.get( 'Last-Modified' ) or validators.get( 'last_modified' ),
+        }
+
+    if headers.get( 'Content-Encoding' ) == 'gzip':
+        contents = gzip.decompress( contents )
+
+    return {
+        'contents': contents,
+        'etag': headers.get( 'ETag' ),
+        'last_modified': headers.get( 'Last-Modified' ),
+    }
+
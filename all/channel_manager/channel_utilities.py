@@ -30,6 +30,8 @@
 import os
 import sys
 import time
+import json
+import hashlib
 
 from distutils.version import LooseVersion
 
@@ -95,6 +97,22 @@ from debug_tools.third_part import write_data_file
 from debug_tools.third_part import convert_to_snake_case
 from debug_tools.third_part import convert_to_pascal_case
 from debug_tools.third_part import compare_text_with_file
+from debug_tools.utilities import sort_list_of_dictionaries
+
+
+try:
+    from .channel_writer import JSON_FORMAT
+    from .channel_writer import JSON_FILE_END
+    from .channel_writer import get_file_digest
+    from .channel_writer import write_json_file
+    from .repository_index import RepositoryIndex
+
+except( ImportError, ValueError):
+    from channel_writer import JSON_FORMAT
+    from channel_writer import JSON_FILE_END
+    from channel_writer import get_file_digest
+    from channel_writer import write_json_file
+    from repository_index import RepositoryIndex
 
 
 # Debugger settings: 0 - disabled, 127 - enabled
@@ -123,6 +141,11 @@ def is_dependency(package_name, repositories_dictionary):
         `channel.json` repository file
     """
     if package_name in repositories_dictionary:
+
+        # The index knows the dependencies without parsing their entries
+        if isinstance( repositories_dictionary, RepositoryIndex ):
+            return repositories_dictionary.is_dependency( package_name )
+
         package_dicitonary = repositories_dictionary[package_name]
         return "load_order" in package_dicitonary
 
@@ -145,7 +168,33 @@ def is_package_dependency(package_name, dependencies, packages):
     return True
 
 
-def load_repository_file(channel_repository_file, load_dependencies=True):
+def close_repository_file(repositories_dictionary):
+    """
+        Close the file and the memory map of the `RepositoryIndex` returned by load_repository_file(),
+        instead of waiting for the garbage collector. The dictionaries loaded from the repository file
+        do not need to be closed.
+    """
+
+    if isinstance( repositories_dictionary, RepositoryIndex ):
+        repositories_dictionary.close()
+
+
+def load_repository_file(channel_repository_file, load_dependencies=True, use_index=True):
+    """
+        The local files on the repository `includes`, as the ones written by the sharded repository
+        files, are loaded together with the `channel_repository_file` packages.
+
+        @param use_index when the `channel_repository_file` has an up to date index, return the
+                         `RepositoryIndex`, which only parses the entries which are used, instead
+                         of loading the whole file
+    """
+
+    if use_index:
+        repository_index = RepositoryIndex.open( channel_repository_file, load_dependencies )
+
+        if repository_index is not None:
+            return repository_index
+
     repositories_dictionary = load_data_file( channel_repository_file )
 
     packages_list = repositories_dictionary.get( 'packages', [] )
@@ -158,9 +207,73 @@ def load_repository_file(channel_repository_file, load_dependencies=True):
     for package in packages_list:
         last_packages_dictionary[package['name']] = package
 
+    for include in repositories_dictionary.get( 'includes', [] ):
+
+        if "://" in include:
+            log( 1, "Warning: Skipping the remote repository include `%s` of the file: %s" % ( include, channel_repository_file ) )
+            continue
+
+        include_path = os.path.join( os.path.dirname( channel_repository_file ), os.path.normpath( include ) )
+        last_packages_dictionary.update( load_repository_file( include_path, load_dependencies, False ) )
+
     return last_packages_dictionary
 
 
+def apply_channel_delta(channel_document, channel_delta):
+    """
+        Update the packages and dependencies of a `repository.json` or `channel.json` document with
+        a delta created by the channel generation, as the function `create_channel_delta()`.
+
+        @return the `channel_document`, with the same contents as the generated file
+    """
+    changed_entries = list( channel_delta['added'].values() ) + list( channel_delta['modified'].values() )
+    changed_names   = set( channel_delta['removed'] ).union( entry['name'] for entry in changed_entries )
+
+    def apply_entries_delta(entries, is_dependencies):
+        entries = [ entry for entry in entries if entry['name'] not in changed_names ]
+        entries.extend( entry for entry in changed_entries if ( "load_order" in entry ) == is_dependencies )
+        return sort_list_of_dictionaries( entries )
+
+    if 'packages_cache' in channel_document:
+
+        for repository_url, entries in channel_document['packages_cache'].items():
+            channel_document['packages_cache'][repository_url] = apply_entries_delta( entries, False )
+
+        for repository_url, entries in channel_document.get( 'dependencies_cache', {} ).items():
+            channel_document['dependencies_cache'][repository_url] = apply_entries_delta( entries, True )
+
+    else:
+        channel_document['packages']     = apply_entries_delta( channel_document.get( 'packages', [] ), False )
+        channel_document['dependencies'] = apply_entries_delta( channel_document.get( 'dependencies', [] ), True )
+
+    return channel_document
+
+
+def apply_channel_delta_file(file_path, channel_delta):
+    """
+        Apply the `channel_delta` to the `channel.json` or `repository.json` on `file_path`, only when
+        it is the same file the delta was created from, and the result is the same generated file.
+
+        @return True when the file was updated
+    """
+    file_name = os.path.basename( file_path )
+    base_digest = channel_delta['base_digests'].get( file_name )
+
+    if not base_digest or get_file_digest( file_path ) != base_digest:
+        log( 1, "Warning: The file `%s` is not the one the channel delta was created from, download it again.", file_path )
+        return False
+
+    channel_document = apply_channel_delta( load_data_file( file_path ), channel_delta )
+    encoded_document = json.dumps( channel_document, **JSON_FORMAT ) + JSON_FILE_END
+
+    if hashlib.sha256( encoded_document.encode( 'utf-8' ) ).hexdigest() != channel_delta['digests'].get( file_name ):
+        log( 1, "Warning: The channel delta did not create the generated file `%s`, download it again.", file_path )
+        return False
+
+    write_json_file( file_path, channel_document )
+    return True
+
+
 def get_installed_packages(exclusion_list=[], list_default_packages=False, list_dependencies=False):
 
     if PackageManager:
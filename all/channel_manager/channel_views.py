@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Channel Views, the channel files with only the releases of some Sublime Text builds
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+
+from collections import OrderedDict
+from collections import namedtuple
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from .version_range import VersionRange
+    from .channel_writer import write_json_file
+    from .channel_writer import get_digest_file_path
+
+except( ImportError, ValueError ):
+    from version_range import VersionRange
+    from channel_writer import write_json_file
+    from channel_writer import get_digest_file_path
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# @param first_build the first Sublime Text build on the bucket, or `-inf`
+# @param last_build  the last Sublime Text build on the bucket, or `inf`
+# @param selections  a tuple with the index of the release used by each entry on the bucket, or None
+#                    when the entry has no release for these builds
+BuildBucket = namedtuple( "BuildBucket", "first_build last_build selections" )
+
+
+def get_build_boundaries(entries):
+    """
+        The releases `sublime_text` ranges are created from the builds `tags` on the submodules
+        `settings.json` files, as `<=3143` and `>3143`, then the builds where some range starts or
+        ends are the ones where some package changes its release.
+
+        @return a sorted list with the first build of each range of builds after the first one
+    """
+    boundaries = set()
+
+    for entry in entries:
+
+        for release in entry.get( 'releases', [] ):
+            version_range = VersionRange.parse( release.get( 'sublime_text', '*' ) )
+
+            if version_range is None:
+                continue
+
+            if version_range.min_build != float( "-inf" ):
+                boundaries.add( version_range.min_build )
+
+            if version_range.max_build != float( "inf" ):
+                boundaries.add( version_range.max_build + 1 )
+
+    return sorted( boundaries )
+
+
+def get_release_index(entry, first_build, last_build):
+    """
+        @return the index of the first `entry` release compatible with all the builds from `first_build`
+                to `last_build`, as the clients use the first compatible one, or None when there is none
+    """
+
+    for index, release in enumerate( entry.get( 'releases', [] ) ):
+        version_range = VersionRange.parse( release.get( 'sublime_text', '*' ) )
+
+        if version_range is not None and version_range.min_build <= first_build and last_build <= version_range.max_build:
+            return index
+
+    return None
+
+
+def get_build_buckets(entries):
+    """
+        Split all the Sublime Text builds on the ranges where each entry uses the same release. The
+        consecutive ranges with the same releases are merged, and the ranges without releases for
+        any entry are skipped.
+
+        @param entries a list with all the packages and dependencies entries
+        @return a list of `BuildBucket`, sorted by their first build
+    """
+    boundaries   = get_build_boundaries( entries )
+    first_builds = [ float( "-inf" ) ] + boundaries
+    last_builds  = [ build - 1 for build in boundaries ] + [ float( "inf" ) ]
+
+    buckets = []
+
+    for first_build, last_build in zip( first_builds, last_builds ):
+        selections = tuple( get_release_index( entry, first_build, last_build ) for entry in entries )
+
+        if buckets and buckets[-1].selections == selections:
+            buckets[-1] = buckets[-1]._replace( last_build=last_build )
+
+        else:
+            buckets.append( BuildBucket( first_build, last_build, selections ) )
+
+    return [ bucket for bucket in buckets if any( index is not None for index in bucket.selections ) ]
+
+
+def get_bucket_range(bucket):
+    """
+        @return the bucket builds as a release `sublime_text` value, as `3092 - 3143` or `>=3144`
+    """
+
+    if bucket.first_build == float( "-inf" ):
+        return "*" if bucket.last_build == float( "inf" ) else "<=%d" % bucket.last_build
+
+    if bucket.last_build == float( "inf" ):
+        return ">=%d" % bucket.first_build
+
+    return "%d - %d" % ( bucket.first_build, bucket.last_build )
+
+
+def get_bucket_entries(entries, selections):
+    """
+        @return a list with the entries which have a release on the bucket, with only that release
+    """
+    bucket_entries = []
+
+    for entry, index in zip( entries, selections ):
+
+        if index is None:
+            continue
+
+        bucket_entry = OrderedDict( entry )
+        bucket_entry['releases'] = [ entry['releases'][index] ]
+        bucket_entries.append( bucket_entry )
+
+    return bucket_entries
+
+
+def write_build_views(file_path, repository_url, repositories, dependencies):
+    """
+        Write one channel file for each Sublime Text builds bucket, with only the release used by
+        those builds for each package, on the directory `file_path` without its extension. The
+        `file_path` lists the views files with their builds ranges. The views files which are not
+        listed anymore are removed.
+
+        @param file_path      the views index file path, as `channel_builds.json`
+        @param repository_url the repository url where the views packages are cached, as on the
+                              channel file `packages_cache`
+        @return a list with the written files paths, starting by the `file_path`
+    """
+    views_directory = os.path.splitext( file_path )[0]
+    views_directory_name = os.path.basename( views_directory )
+
+    entries = list( repositories ) + list( dependencies )
+    packages_count = len( repositories )
+
+    if not os.path.isdir( views_directory ):
+        os.makedirs( views_directory )
+
+    views_paths = []
+    views = []
+
+    for bucket in get_build_buckets( entries ):
+        view_name = "%d.json" % max( 0, bucket.first_build )
+        view_path = os.path.join( views_directory, view_name )
+
+        view_file = OrderedDict()
+        view_file['repositories'] = [ repository_url ]
+        view_file['schema_version'] = "3.0.0"
+
+        view_file['packages_cache'] = OrderedDict()
+        view_file['packages_cache'][repository_url] = get_bucket_entries( entries[:packages_count], bucket.selections[:packages_count] )
+
+        view_file['dependencies_cache'] = OrderedDict()
+        view_file['dependencies_cache'][repository_url] = get_bucket_entries( entries[packages_count:], bucket.selections[packages_count:] )
+
+        write_json_file( view_path, view_file )
+        views_paths.append( view_path )
+
+        view = OrderedDict()
+        view['sublime_text'] = get_bucket_range( bucket )
+        view['file'] = "./%s/%s" % ( views_directory_name, view_name )
+        views.append( view )
+
+    remove_stale_views( views_directory, views_paths )
+
+    views_file = OrderedDict()
+    views_file['schema_version'] = "3.0.0"
+    views_file['views'] = views
+
+    write_json_file( file_path, views_file )
+    log( 1, "Wrote %d channel views for the Sublime Text builds: %s", len( views ), ", ".join( view['sublime_text'] for view in views ) )
+
+    return [ file_path ] + views_paths
+
+
+def remove_stale_views(views_directory, views_paths):
+    views_paths = set( views_paths )
+
+    for file_name in os.listdir( views_directory ):
+        view_path = os.path.join( views_directory, file_name )
+
+        if file_name.endswith( ".json" ) and view_path not in views_paths:
+            log( 1, "Removing the stale channel view file: %s", view_path )
+            os.remove( view_path )
+
+            if os.path.exists( get_digest_file_path( view_path ) ):
+                os.remove( get_digest_file_path( view_path ) )
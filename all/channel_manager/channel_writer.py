@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Writer, write the channel files encoding their packages only once
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import io
+import re
+import json
+import hashlib
+import contextlib
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The same format used by `debug_tools.third_part.write_data_file()`, which also ends the files
+# with a new line
+JSON_FORMAT = { "indent": 4, "separators": (',', ': ') }
+JSON_FILE_END = "\n"
+
+# The encoded lists are written where these markers are on the encoded document
+ENCODED_LIST_MARKER = "@@CHANNEL_MANAGER_ENCODED_LIST_%d@@"
+ENCODED_LIST_REGEX  = re.compile( r'"@@CHANNEL_MANAGER_ENCODED_LIST_(\d+)@@"' )
+
+# How many bytes to hold in memory before writing them to the file
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+# The written files digests are saved on a file with the same name, plus this extension
+DIGEST_FILE_EXTENSION = ".sha256"
+
+
+class EncodedList(object):
+    """
+        A list of package entries which is encoded only once, and then written on several documents
+        by write_json_file().
+    """
+
+    def __init__(self, entries):
+        self.entries   = entries
+        self.fragments = [ json.dumps( entry, **JSON_FORMAT ) for entry in entries ]
+
+    def __len__(self):
+        return len( self.fragments )
+
+    def subset(self, indexes):
+        """
+            @return an `EncodedList` with only the entries on the `indexes`, without encoding them again
+        """
+        encoded_list = EncodedList( [] )
+
+        encoded_list.entries   = [ self.entries[index] for index in indexes ]
+        encoded_list.fragments = [ self.fragments[index] for index in indexes ]
+        return encoded_list
+
+    def write(self, output_file, indentation):
+        """
+            Write the list as `json.dump()` would do, when it starts on a line with `indentation`.
+        """
+
+        if not self.fragments:
+            output_file.write( "[]" )
+            return
+
+        # Each fragment was encoded with `JSON_FORMAT` starting at the column 0, and json does not allow
+        # raw new lines inside the strings values, then all new lines are between the json tokens and
+        # can be re-indented
+        item_indentation = "\n" + " " * ( indentation + 4 )
+        last_index = len( self.fragments ) - 1
+
+        output_file.write( "[" )
+
+        for index, fragment in enumerate( self.fragments ):
+            output_file.write( item_indentation )
+            output_file.write( fragment.replace( "\n", item_indentation ) )
+
+            if index < last_index:
+                output_file.write( "," )
+
+        output_file.write( "\n" + " " * indentation + "]" )
+
+
+def write_json_file(file_path, document):
+    """
+        Write the `document` with the same format as write_data_file(), but the `EncodedList` values
+        are copied from their already encoded fragments. The file is written on a temporary file,
+        which replaces the `file_path` after it was completely written.
+
+        The file is not written when its contents would not change, and its sha256 digest is saved
+        on the file `file_path + DIGEST_FILE_EXTENSION`, which can be used as its ETag.
+
+        @return the file contents sha256 hexadecimal digest
+    """
+    encoded_lists = []
+
+    def encode_list(value):
+
+        if isinstance( value, EncodedList ):
+            encoded_lists.append( value )
+            return ENCODED_LIST_MARKER % ( len( encoded_lists ) - 1 )
+
+        raise TypeError( "%r is not JSON serializable" % value )
+
+    encoded_document = json.dumps( document, default=encode_list, **JSON_FORMAT ) + JSON_FILE_END
+
+    # The contents are hashed before writing them, then the unchanged files are not touched
+    digest_writer = DigestWriter()
+    write_encoded_document( digest_writer, encoded_document, encoded_lists )
+
+    digest = digest_writer.hexdigest()
+
+    if read_file_digest( file_path, digest_writer.size ) == digest:
+        log( 1, "Skipping the unchanged data file: " + str( file_path ) )
+
+    else:
+        log( 1, "Writing to the data file: " + str( file_path ) )
+
+        with atomic_file_writer( file_path ) as output_file:
+            write_encoded_document( output_file, encoded_document, encoded_lists )
+
+    write_file_digest( file_path, digest )
+    return digest
+
+
+def write_encoded_document(output_file, encoded_document, encoded_lists):
+    """
+        @param encoded_document the document encoded with the `ENCODED_LIST_MARKER` markers
+        @param encoded_lists    the `EncodedList` for each marker
+    """
+    last_end = 0
+
+    for match in ENCODED_LIST_REGEX.finditer( encoded_document ):
+        output_file.write( encoded_document[last_end:match.start()] )
+
+        line_start  = encoded_document.rfind( "\n", 0, match.start() ) + 1
+        line_prefix = encoded_document[line_start:match.start()]
+
+        encoded_lists[int( match.group( 1 ) )].write( output_file, len( line_prefix ) - len( line_prefix.lstrip( " " ) ) )
+        last_end = match.end()
+
+    output_file.write( encoded_document[last_end:] )
+
+
+class DigestWriter(object):
+    """
+        A file like object which only computes the sha256 digest and size of what is written on it,
+        as the contents would be encoded on the file.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.hasher = hashlib.sha256()
+
+    def write(self, text):
+        data = text.encode( 'utf-8' )
+
+        self.size += len( data )
+        self.hasher.update( data )
+
+    def hexdigest(self):
+        return self.hasher.hexdigest()
+
+
+def get_digest_file_path(file_path):
+    return file_path + DIGEST_FILE_EXTENSION
+
+
+def read_file_digest(file_path, expected_size):
+    """
+        The saved digest is only trusted when the file still has the same size, and it was not
+        changed after the digest was saved. Otherwise, the file is hashed.
+
+        @return the `file_path` sha256 hexadecimal digest, or None when it does not exist or it does
+                not have the `expected_size`
+    """
+
+    try:
+        file_status = os.stat( file_path )
+
+    except OSError:
+        return None
+
+    if file_status.st_size != expected_size:
+        return None
+
+    digest = read_saved_digest( file_path, file_status.st_mtime )
+
+    if digest:
+        return digest
+
+    hasher = hashlib.sha256()
+
+    with open( file_path, 'rb' ) as input_file:
+
+        for chunk in iter( lambda: input_file.read( OUTPUT_BUFFER_SIZE ), b"" ):
+            hasher.update( chunk )
+
+    return hasher.hexdigest()
+
+
+def read_saved_digest(file_path, modification_time):
+    """
+        @return the digest saved for the `file_path`, or None when there is none, or when it is
+                older than the `file_path` `modification_time`
+    """
+    digest_file_path = get_digest_file_path( file_path )
+
+    try:
+        if os.path.getmtime( digest_file_path ) < modification_time:
+            return None
+
+        with io.open( digest_file_path, 'r', encoding='utf-8' ) as digest_file:
+            digest = digest_file.read().split( " " )[0].strip()
+
+    except ( IOError, OSError ):
+        return None
+
+    return digest if len( digest ) == 64 else None
+
+
+def get_file_digest(file_path):
+    """
+        @return the `file_path` sha256 hexadecimal digest, or None when it does not exist
+    """
+
+    try:
+        return read_file_digest( file_path, os.path.getsize( file_path ) )
+
+    except OSError:
+        return None
+
+
+def write_file_digest(file_path, digest):
+    """
+        Save the digest on the same format as the `sha256sum` command, if it changed or if it is
+        older than the file, as it is not trusted by read_file_digest() anymore.
+    """
+    digest_line = "%s  %s\n" % ( digest, os.path.basename( file_path ) )
+    digest_file_path = get_digest_file_path( file_path )
+
+    try:
+        if os.path.getmtime( digest_file_path ) >= os.path.getmtime( file_path ):
+
+            with io.open( digest_file_path, 'r', encoding='utf-8' ) as digest_file:
+
+                if digest_file.read() == digest_line:
+                    return
+
+    except ( IOError, OSError ):
+        pass
+
+    with atomic_file_writer( digest_file_path ) as digest_file:
+        digest_file.write( digest_line )
+
+
+@contextlib.contextmanager
+def atomic_file_writer(file_path, mode='w'):
+    """
+        Open a temporary file on the same directory of `file_path` for writing, and rename it over
+        `file_path` only when it was completely written, then a crash never leaves a truncated file.
+
+        @param mode `w` to write UTF-8 text with Unix new lines, or `wb` to write bytes
+    """
+    temporary_path = "%s.%s.tmp" % ( file_path, os.getpid() )
+
+    if 'b' in mode:
+        open_arguments = {}
+
+    else:
+        open_arguments = { 'newline': '\n', 'encoding': 'utf-8' }
+
+    try:
+
+        with io.open( temporary_path, mode, buffering=OUTPUT_BUFFER_SIZE, **open_arguments ) as output_file:
+            yield output_file
+
+        os.replace( temporary_path, file_path )
+
+    finally:
+
+        if os.path.exists( temporary_path ):
+            os.remove( temporary_path )
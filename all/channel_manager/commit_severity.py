@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Commit Severity, suggest the next tag severity from the commits since the last tag
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import re
+
+from collections import namedtuple
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The same severity levels used by the function `get_last_tag_fixed()`
+MAJOR_SEVERITY      = 1
+MINOR_SEVERITY      = 2
+PATCH_SEVERITY      = 3
+NO_CHANGES_SEVERITY = 4
+
+SEVERITY_NAMES = { MAJOR_SEVERITY: "Major", MINOR_SEVERITY: "Minor", PATCH_SEVERITY: "Patch", NO_CHANGES_SEVERITY: "No Changes" }
+
+# The conventional commits subjects as `feat(parser)!: message`
+# https://www.conventionalcommits.org/en/v1.0.0/
+CONVENTIONAL_COMMIT_REGEX = re.compile( r'^(\w+)(?:\([^)]*\))?(!)?:\s' )
+BREAKING_CHANGE_REGEX     = re.compile( r'^BREAKING[ -]CHANGE:', re.MULTILINE )
+
+# The conventional commits types which are new features, all the others are patches
+MINOR_COMMIT_TYPES = { "feat", "feature" }
+
+# Without a feature commit, these many commits or changes since the last tag suggest a Minor release
+MINOR_COMMITS_COUNT = 20
+MINOR_CHANGED_FILES = 30
+MINOR_CHANGED_LINES = 1000
+
+# Each commit message is started by a `start of text` and ended by an `end of text` characters, which
+# are followed by its `--shortstat` line. The command output can be stripped, but python does not
+# consider these characters white spaces, as the `\x1c` to `\x1f` separators
+COMMIT_START = "\x02"
+COMMIT_END   = "\x03"
+
+GIT_LOG_FORMAT = "--format=%x02%B%x03"
+
+SHORTSTAT_REGEX = re.compile( r'(\d+) files? changed(?:, (\d+) insertions?\(\+\))?(?:, (\d+) deletions?\(-\))?' )
+
+
+# @param message        the commit message, with its subject and body
+# @param files_changed  how many files the commit changed
+# @param lines_changed  how many lines the commit inserted and deleted
+GitCommit = namedtuple( "GitCommit", "message files_changed lines_changed" )
+
+# @param severity_level see the function `get_last_tag_fixed()`
+# @param commits_count  how many commits there are since the last tag, without the merge commits
+# @param files_changed  the sum of the files changed by each commit
+# @param lines_changed  the sum of the lines inserted and deleted by each commit
+# @param reason         why the `severity_level` was suggested, as the commit subject which decided it
+SeveritySuggestion = namedtuple( "SeveritySuggestion", "severity_level commits_count files_changed lines_changed reason" )
+
+
+def get_severity_name(severity_level):
+    return SEVERITY_NAMES.get( severity_level, str( severity_level ) )
+
+
+def get_git_log_command(git_tag):
+    """
+        @param git_tag the last repository tag, or None when the repository has no tags
+        @return the command listing all the commits since `git_tag` with their statistics
+    """
+    revisions = "refs/tags/%s..HEAD" % git_tag if git_tag else "HEAD"
+    return [ "git", "log", "--no-merges", "--shortstat", GIT_LOG_FORMAT, revisions, "--" ]
+
+
+def parse_git_log(output):
+    """
+        @param output the `get_git_log_command()` output
+        @return a list of `GitCommit`, from the newest to the oldest commit
+    """
+    commits = []
+
+    for record in output.split( COMMIT_START )[1:]:
+        message, _, statistics = record.partition( COMMIT_END )
+        statistics_match = SHORTSTAT_REGEX.search( statistics )
+
+        if statistics_match:
+            files_changed, insertions, deletions = statistics_match.groups()
+            commits.append( GitCommit( message.strip(), int( files_changed ), int( insertions or 0 ) + int( deletions or 0 ) ) )
+
+        else:
+            commits.append( GitCommit( message.strip(), 0, 0 ) )
+
+    return commits
+
+
+def get_commit_severity(message):
+    """
+        @return the severity level of a conventional commit `message`, or None when it is not one
+    """
+    conventional_match = CONVENTIONAL_COMMIT_REGEX.match( message )
+
+    if BREAKING_CHANGE_REGEX.search( message ) or ( conventional_match and conventional_match.group( 2 ) ):
+        return MAJOR_SEVERITY
+
+    if conventional_match is None:
+        return None
+
+    if conventional_match.group( 1 ).lower() in MINOR_COMMIT_TYPES:
+        return MINOR_SEVERITY
+
+    return PATCH_SEVERITY
+
+
+def suggest_severity_level(commits):
+    """
+        The breaking changes suggest a Major release and the new features a Minor one. When there
+        is none of them, many commits or changes since the last tag also suggest a Minor release,
+        otherwise a Patch one.
+
+        @param commits a list of `GitCommit` since the last tag
+        @return a `SeveritySuggestion`
+    """
+    files_changed = sum( commit.files_changed for commit in commits )
+    lines_changed = sum( commit.lines_changed for commit in commits )
+
+    if not commits:
+        return SeveritySuggestion( NO_CHANGES_SEVERITY, 0, 0, 0, "no commits since the last tag" )
+
+    severity_level = PATCH_SEVERITY
+    reason = "%d commits" % len( commits )
+
+    for commit in commits:
+        commit_severity = get_commit_severity( commit.message )
+
+        if commit_severity is not None and commit_severity < severity_level:
+            severity_level = commit_severity
+            reason = commit.message.split( "\n" )[0]
+
+    if severity_level == PATCH_SEVERITY and ( len( commits ) >= MINOR_COMMITS_COUNT
+            or files_changed >= MINOR_CHANGED_FILES or lines_changed >= MINOR_CHANGED_LINES ):
+        severity_level = MINOR_SEVERITY
+        reason = "%d commits changing %d files and %d lines" % ( len( commits ), files_changed, lines_changed )
+
+    return SeveritySuggestion( severity_level, len( commits ), files_changed, lines_changed, reason )
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Generation Journal, resume the interrupted channel generation runs
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import json
+import time
+import hashlib
+
+from collections import OrderedDict
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from . import settings as g_settings
+
+except( ImportError, ValueError ):
+    import settings as g_settings
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The repositories entries already created by the running `all` command
+CHANNEL_GENERATION_JOURNAL_FILE = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "all", "last_generation_journal.jsonl" )
+
+# Increment this when the journaled entries format change, to not resume from the old journals
+GENERATION_JOURNAL_VERSION = 2
+
+
+class GenerationJournal(object):
+    """
+        An append only file with the entries created for each `.gitmodules` section by the `all`
+        command, one json object by line. When the command is interrupted, the next run with the same
+        journal `key` reuses the journaled entries, instead of processing those sections again.
+
+        The entries are written as the sections are processed, but they are only flushed to the disk
+        after `checkpoint_interval` seconds since the last checkpoint, or when the journal is closed.
+    """
+
+    def __init__(self, file_path, key, checkpoint_interval):
+        """
+            @param key a string which changes when the journaled entries cannot be reused anymore,
+                       see the function get_journal_key()
+        """
+        self.file_path = file_path
+        self.key = key
+        self.checkpoint_interval = checkpoint_interval
+
+        self.output_file = None
+        self.last_checkpoint = time.time()
+
+        self.pending_count = 0
+
+        # How many bytes of the existing file have complete records, then a record truncated by a
+        # crash is overwritten by the next one
+        self.valid_size = 0
+        self.records = self._load()
+
+    def _load(self):
+        records = OrderedDict()
+
+        try:
+            with open( self.file_path, 'rb' ) as input_file:
+                lines = iter( input_file )
+                header_line = next( lines, b"" )
+                header = self._parse_line( header_line )
+
+                if not header or header.get( 'version' ) != GENERATION_JOURNAL_VERSION or header.get( 'key' ) != self.key:
+                    return records
+
+                self.valid_size = len( header_line )
+
+                for line in lines:
+                    record = self._parse_line( line )
+
+                    if record is None:
+                        break
+
+                    records[record['section']] = record
+                    self.valid_size += len( line )
+
+        except ( IOError, OSError ):
+            pass
+
+        if records:
+            log( 1, "Found %d repositories entries on the generation journal: %s", len( records ), self.file_path )
+
+        return records
+
+    @staticmethod
+    def _parse_line(line):
+        """
+            @return the json object on the `line`, or None when it is not a complete record
+        """
+
+        if not line.endswith( b"\n" ):
+            return None
+
+        try:
+            return json.loads( line.decode( 'utf-8' ), object_pairs_hook=OrderedDict )
+
+        except ValueError:
+            return None
+
+    def get(self, section, fingerprint):
+        """
+            @param fingerprint the repository fingerprint, see the function `Repository.getFingerprint()`,
+                               which must be the same as when its entries were journaled
+            @return the journaled record for the `.gitmodules` section, or None when there is none
+        """
+        record = self.records.get( section )
+
+        if record and fingerprint and record['fingerprint'] == fingerprint:
+            return record
+
+        return None
+
+    def record(self, section, fingerprint, repositories, dependencies):
+        """
+            Journal the entries created for the `.gitmodules` section.
+
+            @param fingerprint the repository fingerprint, see the function `Repository.getFingerprint()`
+        """
+
+        if not fingerprint:
+            return
+
+        last_record = self.records.get( section )
+
+        # The resumed records are already on the file
+        if last_record and last_record['fingerprint'] == fingerprint:
+            return
+
+        record = OrderedDict()
+        record['section'] = section
+        record['fingerprint'] = fingerprint
+        record['repositories'] = repositories
+        record['dependencies'] = dependencies
+
+        if self.output_file is None:
+            self._open()
+
+        self.output_file.write( json.dumps( record ).encode( 'utf-8' ) + b"\n" )
+        self.records[section] = record
+        self.pending_count += 1
+
+        if time.time() - self.last_checkpoint >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def _open(self):
+
+        if self.valid_size:
+            self.output_file = open( self.file_path, 'r+b' )
+            self.output_file.truncate( self.valid_size )
+            self.output_file.seek( self.valid_size )
+
+        else:
+            header = OrderedDict()
+            header['version'] = GENERATION_JOURNAL_VERSION
+            header['key'] = self.key
+
+            self.output_file = open( self.file_path, 'wb' )
+            self.output_file.write( json.dumps( header ).encode( 'utf-8' ) + b"\n" )
+
+    def checkpoint(self):
+        self.last_checkpoint = time.time()
+
+        if self.output_file is None or not self.pending_count:
+            return
+
+        self.output_file.flush()
+        os.fsync( self.output_file.fileno() )
+
+        log( 1, "Saved a checkpoint with %d repositories entries on the generation journal.", len( self.records ) )
+        self.pending_count = 0
+
+    def close(self):
+
+        if self.output_file is not None:
+            self.checkpoint()
+            self.output_file.close()
+            self.output_file = None
+
+    def remove(self):
+        """
+            Remove the journal after the generated files were saved, then the next run starts over.
+        """
+        self.close()
+
+        if os.path.exists( self.file_path ):
+            os.remove( self.file_path )
+
+
+def get_journal_key(gitmodules_path, channel_settings):
+    """
+        @return a digest of the `.gitmodules` file and the channel settings, which are the same for
+                the runs which can resume the other ones journal
+    """
+    hasher = hashlib.sha256()
+    hasher.update( str( GENERATION_JOURNAL_VERSION ).encode( 'utf-8' ) )
+
+    try:
+        with open( gitmodules_path, 'rb' ) as gitmodules_file:
+            hasher.update( gitmodules_file.read() )
+
+    except ( IOError, OSError ):
+        pass
+
+    hasher.update( json.dumps( channel_settings, sort_keys=True, default=str ).encode( 'utf-8' ) )
+    return hasher.hexdigest()
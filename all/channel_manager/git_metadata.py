@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Git Metadata, read the git submodules tags and references
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import time
+import zlib
+import shlex
+import hashlib
+import functools
+
+from collections import namedtuple
+from collections import OrderedDict
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The tags are listed on the same order as `git tag --sort=-creatordate --sort=version:refname`
+# https://git-scm.com/docs/git-for-each-ref#_field_names
+GIT_TAGS_COMMAND = shlex.split(
+        "git for-each-ref --sort=-creatordate --sort=version:refname "
+        "--format=%(refname)%09%(objectname)%09%(*objectname)%09%(committerdate:iso)%09%(*committerdate:iso) "
+        "refs/tags" )
+
+
+# @param name         the tag name as `1.0.0`
+# @param object_name  the object id the tag reference points to, i.e., the tag object for annotated tags
+# @param commit       the object id of the tagged commit
+# @param date         the tagged commit date as `2018-02-16 01:40:11 -0200`, or None when it is not a commit
+GitTag = namedtuple( "GitTag", "name object_name commit date" )
+
+
+class GitTagsTable(object):
+    """
+        Holds all the tags of a git repository, read by one `git for-each-ref` call, instead of
+        running one git process for each question asked about the repository tags.
+    """
+
+    def __init__(self, absolute_path, tags, reader=None):
+        self.absolute_path = absolute_path
+
+        # sorted on the same order as `git tag --sort=-creatordate --sort=version:refname`
+        self.tags = tags
+
+        self.tags_by_name = OrderedDict()
+        self.head = None
+
+        # When the table was read from the git directory files, the tags commits and dates are only
+        # resolved when asked for, by the `GitRepositoryReader`
+        self.reader = reader
+        self.resolved_tags = {}
+
+        for tag in tags:
+            self.tags_by_name[tag.name] = tag
+
+    def __len__(self):
+        return len( self.tags )
+
+    def __contains__(self, tag_name):
+        return tag_name in self.tags_by_name
+
+    def get(self, tag_name):
+        return self.tags_by_name.get( tag_name )
+
+    def names(self):
+        return [ tag.name for tag in self.tags ]
+
+    def get_tag_date(self, tag_name):
+        """
+            @return the tagged commit date as `2018-02-16 01:40:11`, or None when it is not known.
+        """
+        tag = self.tags_by_name.get( tag_name )
+
+        if tag:
+            tag = self.resolve_tag( tag )
+
+        if tag and tag.date:
+            return tag.date[0:19]
+
+        return None
+
+    def resolve_tag(self, tag):
+        """
+            @return the `tag` with its commit and date, as they were read by `git for-each-ref`
+        """
+
+        if self.reader is None:
+            return tag
+
+        if tag.name not in self.resolved_tags:
+            self.resolved_tags[tag.name] = self.reader.resolve_tag( tag )
+
+        return self.resolved_tags[tag.name]
+
+    def get_head(self, command_line_interface):
+        """
+            The HEAD commit is only required when creating tags, then it is only read when asked.
+        """
+
+        if self.head is None and self.reader is not None:
+            self.head = self.reader.read_head()
+
+        if self.head is None:
+            command = shlex.split( "git rev-parse HEAD" )
+            output  = command_line_interface.execute( command, self.absolute_path, short_errors=True )
+
+            if output is False:
+                return None
+
+            self.head = output.strip()
+
+        return self.head
+
+    def get_tags_pointing_at(self, commit):
+        """
+            The same as `git tag -l --points-at <commit>`, but without running git again.
+
+            @return a list with the tags names sorted by name
+        """
+        return sorted( tag.name for tag in self.tags
+                if tag.object_name == commit or self.resolve_tag( tag ).commit == commit )
+
+
+def parse_git_tags(output):
+    """
+        @param output the `GIT_TAGS_COMMAND` output
+        @return a list of `GitTag`
+    """
+    tags = []
+
+    for line in output.split( "\n" ):
+        fields = line.split( "\t" )
+
+        if len( fields ) < 2 or len( fields ) > 5 or not fields[0].startswith( "refs/tags/" ):
+            continue
+
+        # The command output trailing white spaces can be stripped with the last empty fields
+        fields.extend( [""] * ( 5 - len( fields ) ) )
+
+        reference, object_name, peeled_object, date, peeled_date = fields
+
+        # Annotated tags point to a tag object, and only the peeled object is the tagged commit
+        if peeled_object:
+            tags.append( GitTag( reference[10:], object_name, peeled_object, peeled_date or None ) )
+
+        else:
+            tags.append( GitTag( reference[10:], object_name, object_name, date or None ) )
+
+    return tags
+
+
+def read_git_tags_table(absolute_path, command_line_interface):
+    """
+        @return a `GitTagsTable`, or None when the git command failed
+    """
+    output = command_line_interface.execute( GIT_TAGS_COMMAND, absolute_path, short_errors=True )
+
+    if output is False or "warning:" in output:
+        log( 1, "Error: Failed reading the git tags for the package `%s`, results: %s" % ( absolute_path, output ) )
+        return None
+
+    return GitTagsTable( absolute_path, parse_git_tags( output ) )
+
+
+def read_git_tags_table_from_files(absolute_path, command_line_interface, object_server=None):
+    """
+        Read the tags table from the git directory files, as read_git_tags_table() would do, but
+        without running git, unless some tag object is packed and cannot be read.
+
+        @param object_server see GitRepositoryReader
+        @return a `GitTagsTable`, or None when the git directory was not found
+    """
+    reader = GitRepositoryReader.open( absolute_path, command_line_interface, object_server )
+
+    if reader is None:
+        return None
+
+    return GitTagsTable( absolute_path, reader.read_tags(), reader )
+
+
+class GitRepositoryReader(object):
+    """
+        Reads the references and the loose objects directly from the git directory files, instead of
+        starting one git process for each read only question. The objects stored on the pack files
+        are not decoded, then they are read by the `object_server`, or all the tags are read from
+        `git for-each-ref` when one of them is packed, which is still only one git process for the
+        whole repository.
+
+        @param object_server None, or a function as GitObjectServer.read_object() which reads the
+                             packed objects
+    """
+
+    def __init__(self, absolute_path, git_directory, command_line_interface, object_server=None):
+        self.absolute_path = absolute_path
+        self.git_directory = git_directory
+        self.command_line_interface = command_line_interface
+        self.object_server = object_server
+
+        self.common_directory = get_git_common_directory( git_directory )
+        self.objects_directory = os.path.join( self.common_directory, "objects" )
+
+        self.peeled_references = {}
+        self.fallback_table = None
+
+    @classmethod
+    def open(cls, absolute_path, command_line_interface, object_server=None):
+        """
+            @return a `GitRepositoryReader`, or None when the git directory was not found
+        """
+        git_directory = get_git_directory( absolute_path )
+
+        if not git_directory:
+            return None
+
+        return cls( absolute_path, git_directory, command_line_interface, object_server )
+
+    def read_tags(self):
+        """
+            @return a list of `GitTag` sorted by version, but without the commits and dates which are
+                    only known after reading their objects with resolve_tag()
+        """
+        self.peeled_references = read_packed_references_peeled( self.common_directory )[1]
+        tags = []
+
+        for reference, object_id in read_git_references( self.absolute_path, ( "refs/tags/", ) ).items():
+            tags.append( GitTag( reference[10:], object_id, None, None ) )
+
+        # The tags names are unique, then `version:refname` never ties and `-creatordate` is not used
+        tags.sort( key=functools.cmp_to_key( lambda first, second: versioncmp( first.name, second.name ) ) )
+        return tags
+
+    def resolve_tag(self, tag):
+        """
+            @return the `tag` with its tagged commit and the commit date
+        """
+        peeled_object = self.peel_object( tag.object_name )
+        peeled_commit = self.peeled_references.get( "refs/tags/" + tag.name )
+
+        # The `packed-refs` file has the tagged commit when the tag object itself could not be read
+        if peeled_object is None and peeled_commit:
+            peeled_object = self.peel_object( peeled_commit )
+
+        if peeled_object is None:
+            return self.get_fallback_tag( tag )
+
+        commit, date = peeled_object
+        return GitTag( tag.name, tag.object_name, commit, date )
+
+    def get_fallback_tag(self, tag):
+        """
+            Read all the tags with `git for-each-ref` when the first packed tag object is found.
+        """
+
+        if self.fallback_table is None:
+            self.fallback_table = read_git_tags_table( self.absolute_path, self.command_line_interface ) or False
+
+        return ( self.fallback_table and self.fallback_table.get( tag.name ) ) or tag
+
+    def read_head(self):
+        """
+            @return the HEAD commit as `git rev-parse HEAD`, or None when it could not be read
+        """
+        head = ( read_binary_file( os.path.join( self.git_directory, "HEAD" ) ) or b"" ).decode( 'utf-8' ).strip()
+
+        # Follow the symbolic references as `ref: refs/heads/master`, up to the same limit used by git
+        for depth in range( 5 ):
+
+            if not head.startswith( "ref:" ):
+                return head or None
+
+            reference = head[4:].strip()
+            head = None
+
+            for directory in ( self.git_directory, self.common_directory ):
+                contents = read_binary_file( os.path.join( directory, *reference.split( "/" ) ) )
+
+                if contents is not None:
+                    head = contents.decode( 'utf-8' ).strip()
+                    break
+
+            if head is None:
+                head = read_packed_references( self.common_directory ).get( reference, "" )
+
+        return None
+
+    def read_branch_date(self, branch):
+        """
+            @return the date of the last commit of `branch` as `master`, or None when it is not a
+                    loose commit object
+        """
+        object_id = read_git_references( self.absolute_path, ( "refs/heads/", ) ).get( "refs/heads/" + branch )
+        peeled_object = object_id and self.peel_object( object_id )
+
+        return peeled_object and peeled_object[1]
+
+    def peel_object(self, object_id):
+        """
+            Follow one annotated tag object until the tagged object, as `%(*objectname)` does.
+
+            @return a tuple `(commit, date)`, where date is None when it is not a commit, or None when
+                    some object could not be read
+        """
+        git_object = self.read_object( object_id )
+
+        if git_object is not None and git_object[0] == b"tag":
+            object_id  = get_object_header( git_object[1], b"object" ).decode( 'utf-8' )
+            git_object = self.read_object( object_id )
+
+        if git_object is None:
+            return None
+
+        object_type, contents = git_object
+
+        if object_type == b"commit":
+            return object_id, parse_git_date( get_object_header( contents, b"committer" ) )
+
+        return object_id, None
+
+    def read_object(self, object_id):
+        """
+            @return a tuple `(type, contents)`, or None when the object could not be read
+        """
+        git_object = self.read_loose_object( object_id )
+
+        if git_object is None and self.object_server:
+            git_object = self.object_server( object_id )
+            git_object = git_object and git_object[1:]
+
+        return git_object
+
+    def read_loose_object(self, object_id):
+        """
+            @return a tuple `(type, contents)`, or None when the object is not a loose object
+        """
+        object_file = read_binary_file( os.path.join( self.objects_directory, object_id[0:2], object_id[2:] ) )
+
+        if object_file is None:
+            return None
+
+        try:
+            git_object = zlib.decompress( object_file )
+
+        except zlib.error as error:
+            log( 1, "Warning: Could not decompress the git object `%s`: %s", object_id, error )
+            return None
+
+        header, _, contents = git_object.partition( b"\0" )
+        return header.partition( b" " )[0], contents
+
+
+def get_object_header(contents, name):
+    """
+        @return the value of the first header line `name` of a commit or tag object, as `b"object"`
+    """
+    prefix = name + b" "
+
+    for line in contents.split( b"\n" ):
+
+        # The headers end on the first empty line, before the commit or tag message
+        if not line:
+            break
+
+        if line.startswith( prefix ):
+            return line[len( prefix ):]
+
+    return b""
+
+
+def parse_git_date(signature):
+    """
+        @param signature the committer as `b"Name <email> 1518752411 -0200"`
+        @return the date as `%ci` formats it, i.e., `2018-02-16 01:40:11 -0200`, or None when the
+                signature date is not valid
+    """
+    fields = signature.rsplit( b" ", 2 )
+
+    if len( fields ) != 3:
+        return None
+
+    try:
+        timestamp = int( fields[1] )
+        offset    = fields[2].decode( 'utf-8' )
+        minutes   = int( offset[1:3] ) * 60 + int( offset[3:5] )
+
+    except ValueError:
+        return None
+
+    if offset[0] == "-":
+        minutes = -minutes
+
+    return time.strftime( "%Y-%m-%d %H:%M:%S", time.gmtime( timestamp + minutes * 60 ) ) + " " + offset
+
+
+# The states of the versioncmp() state machine, where `S_N` is a normal character, `S_I` is an
+# integer part, `S_F` is a fractional part and `S_Z` is an integer part with leading zeros
+S_N, S_I, S_F, S_Z = 0, 3, 6, 9
+CMP, LEN = 2, 3
+
+VERSION_NEXT_STATE = (
+    # x    d    0
+    S_N, S_I, S_Z,  # S_N
+    S_N, S_I, S_I,  # S_I
+    S_N, S_F, S_F,  # S_F
+    S_N, S_F, S_Z,  # S_Z
+)
+
+VERSION_RESULT_TYPE = (
+    # x/x  x/d  x/0  d/x  d/d  d/0  0/x  0/d  0/0
+    CMP, CMP, CMP, CMP, LEN, CMP, CMP, CMP, CMP,  # S_N
+    CMP, -1,  -1,  +1,  LEN, LEN, +1,  LEN, LEN,  # S_I
+    CMP, CMP, CMP, CMP, CMP, CMP, CMP, CMP, CMP,  # S_F
+    CMP, +1,  +1,  -1,  CMP, CMP, -1,  CMP, CMP,  # S_Z
+)
+
+
+def _version_character_class(character):
+    return ( character == 48 ) + ( 48 <= character <= 57 )
+
+
+def versioncmp(first, second):
+    """
+        The same comparison used by `git tag --sort=version:refname`, ported from the git file
+        `versioncmp.c`, without the `versionsort.suffix` configuration.
+        https://github.com/git/git/blob/master/versioncmp.c
+
+        @return a negative number, zero or a positive number as `first` is lower, equal or greater
+    """
+    first  = first.encode( 'utf-8' ) + b"\0"
+    second = second.encode( 'utf-8' ) + b"\0"
+
+    index = 0
+    first_character  = first[0]
+    second_character = second[0]
+
+    state = S_N + _version_character_class( first_character )
+
+    while first_character == second_character:
+
+        if first_character == 0:
+            return 0
+
+        state = VERSION_NEXT_STATE[state]
+        index += 1
+
+        first_character  = first[index]
+        second_character = second[index]
+        state += _version_character_class( first_character )
+
+    difference = first_character - second_character
+    state = VERSION_RESULT_TYPE[state * 3 + _version_character_class( second_character )]
+
+    if state == CMP:
+        return difference
+
+    # The longest integer part is the greatest, after the first different character
+    if state == LEN:
+        index += 1
+
+        while 48 <= first[index] <= 57:
+
+            if not 48 <= second[index] <= 57:
+                return 1
+
+            index += 1
+
+        return -1 if 48 <= second[index] <= 57 else difference
+
+    return state
+
+
+def get_git_directory(absolute_path):
+    """
+        Submodules usually have a `.git` file as `gitdir: ../../.git/modules/Package`, instead of
+        a `.git` directory.
+
+        @return the repository git directory path, or None when it is not a git repository
+    """
+    git_path = os.path.join( absolute_path, ".git" )
+
+    if os.path.isdir( git_path ):
+        return git_path
+
+    if os.path.isfile( git_path ):
+        contents = read_binary_file( git_path )
+
+        # The file can be removed or not readable after checking it exists
+        if contents is None:
+            return None
+
+        contents = contents.decode( 'utf-8' ).strip()
+
+        if contents.startswith( "gitdir:" ):
+            return os.path.normpath( os.path.join( absolute_path, contents[7:].strip() ) )
+
+    return None
+
+
+def get_git_common_directory(git_directory):
+    """
+        Linked work trees share the references of the main git directory, which is written on the
+        `commondir` file.
+    """
+    common_directory = read_binary_file( os.path.join( git_directory, "commondir" ) )
+
+    if common_directory is not None:
+        common_directory = common_directory.decode( 'utf-8' ).strip()
+        return os.path.normpath( os.path.join( git_directory, common_directory ) )
+
+    return git_directory
+
+
+def read_binary_file(file_path):
+    """
+        @return the file contents, or None when the file does not exists
+    """
+
+    try:
+        with open( file_path, "rb" ) as file:
+            return file.read()
+
+    except ( IOError, OSError ):
+        return None
+
+
+def get_git_references_fingerprint(absolute_path):
+    """
+        Hash the HEAD commit and all the repository tags only by reading the git directory files,
+        i.e., without running git. Any commit, tag creation or deletion changes the result.
+
+        @return a hexadecimal digest, or None when the git directory was not found
+    """
+    git_directory = get_git_directory( absolute_path )
+
+    if not git_directory:
+        return None
+
+    hasher = hashlib.sha1()
+    common_directory = get_git_common_directory( git_directory )
+
+    head = read_binary_file( os.path.join( git_directory, "HEAD" ) ) or b""
+    hasher.update( head )
+
+    # The HEAD is either a commit, when detached, or a reference as `ref: refs/heads/master`
+    if head.startswith( b"ref:" ):
+        reference = head[4:].strip().decode( 'utf-8' )
+        hasher.update( read_binary_file( os.path.join( common_directory, reference ) ) or b"" )
+
+    # The packed references file holds the packed branches and tags
+    hasher.update( read_binary_file( os.path.join( common_directory, "packed-refs" ) ) or b"" )
+    tags_directory = os.path.join( common_directory, "refs", "tags" )
+
+    for root, directories, files in os.walk( tags_directory ):
+        directories.sort()
+
+        for file_name in sorted( files ):
+            file_path = os.path.join( root, file_name )
+
+            hasher.update( os.path.relpath( file_path, tags_directory ).replace( os.sep, "/" ).encode( 'utf-8' ) )
+            hasher.update( read_binary_file( file_path ) or b"" )
+
+    return hasher.hexdigest()
+
+
+def read_packed_references(common_directory):
+    """
+        @return a dictionary with the references names and object ids on the `packed-refs` file
+    """
+    return read_packed_references_peeled( common_directory )[0]
+
+
+def read_packed_references_peeled(common_directory):
+    """
+        @return a tuple `(references, peeled_references)`, where `peeled_references` has the tagged
+                commits of the annotated tags on the `packed-refs` file
+    """
+    references = OrderedDict()
+    peeled_references = {}
+
+    contents = read_binary_file( os.path.join( common_directory, "packed-refs" ) )
+    reference = None
+
+    if contents:
+
+        for line in contents.decode( 'utf-8' ).splitlines():
+
+            # Skip the header comments
+            if not line or line[0] == "#":
+                continue
+
+            # The peeled object of an annotated tag follows its reference line
+            if line[0] == "^":
+
+                if reference:
+                    peeled_references[reference] = line[1:].strip()
+
+                continue
+
+            object_id, _, reference = line.partition( " " )
+            references[reference] = object_id
+
+    return references, peeled_references
+
+
+def read_git_references(absolute_path, prefixes=("refs/tags/", "refs/heads/")):
+    """
+        Read the references from the git directory files, without running git. The loose references
+        take precedence over the packed ones, as git does.
+
+        @return a dictionary with the references names and object ids, or None when the git
+                directory was not found
+    """
+    git_directory = get_git_directory( absolute_path )
+
+    if not git_directory:
+        return None
+
+    references = OrderedDict()
+    common_directory = get_git_common_directory( git_directory )
+
+    for reference, object_id in read_packed_references( common_directory ).items():
+
+        if reference.startswith( prefixes ):
+            references[reference] = object_id
+
+    for prefix in prefixes:
+        loose_directory = os.path.join( common_directory, *prefix.strip( "/" ).split( "/" ) )
+
+        for root, directories, files in os.walk( loose_directory ):
+
+            for file_name in files:
+                file_path = os.path.join( root, file_name )
+                contents  = ( read_binary_file( file_path ) or b"" ).decode( 'utf-8' ).strip()
+
+                # Symbolic references as `ref: refs/heads/master` are not followed
+                if contents and not contents.startswith( "ref:" ):
+                    reference = prefix + os.path.relpath( file_path, loose_directory ).replace( os.sep, "/" )
+                    references[reference] = contents
+
+    return references
+
+
+def resolve_git_reference(references, name):
+    """
+        Find the reference of `name` as `git log -1 name` would do for a tag or branch name.
+
+        @param references  the dictionary returned by read_git_references()
+        @return a tuple `(reference, object_id)`, or `(None, None)` when it was not found
+    """
+
+    if references:
+
+        for reference in ( "refs/tags/" + name, "refs/heads/" + name ):
+
+            if reference in references:
+                return reference, references[reference]
+
+    return None, None
+
+
+def get_git_cache_references(absolute_path):
+    """
+        @return the current references used to evict the git metadata cache entries, including the
+                `refs/tags` fingerprint of all references, or None when it is not a git repository
+    """
+    references = read_git_references( absolute_path )
+
+    if references is not None:
+        references["refs/tags"] = get_git_references_fingerprint( absolute_path )
+
+    return references
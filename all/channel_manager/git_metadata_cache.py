@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Git Metadata Cache, keep the git submodules metadata between runs
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import json
+import threading
+
+from collections import OrderedDict
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from . import settings as g_settings
+
+    from .git_metadata import get_git_cache_references
+    from .git_metadata import resolve_git_reference
+    from .tag_version import get_latest_numeric_tag
+
+except( ImportError, ValueError ):
+    import settings as g_settings
+
+    from git_metadata import get_git_cache_references
+    from git_metadata import resolve_git_reference
+    from tag_version import get_latest_numeric_tag
+
+
+# Some Sublime Text builds do not ship the sqlite3 module, then the cache is just disabled
+try:
+    import sqlite3
+
+except ImportError:
+    sqlite3 = None
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# Saved on the same folder as the `last_session.json` file
+GIT_METADATA_CACHE_FILE = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "all", "git_metadata_cache.sqlite3" )
+
+# The cached references are immutable, i.e., a reference pointing to the same object id always has
+# the same date. The reference `refs/tags` is used to cache the latest repository tag on the column
+# `version`, and its object id is the fingerprint of all the repository references.
+GIT_METADATA_CACHE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS git_references (
+        repository TEXT NOT NULL,
+        reference  TEXT NOT NULL,
+        object_id  TEXT NOT NULL,
+        date       TEXT,
+        version    TEXT,
+        release    TEXT,
+        PRIMARY KEY ( repository, reference, object_id )
+    )
+"""
+
+# How many changes to wait before committing them to the disk
+MAXIMUM_PENDING_CHANGES = 100
+
+g_git_metadata_cache      = None
+g_git_metadata_cache_lock = threading.Lock()
+
+
+def get_git_metadata_cache():
+    """
+        @return the opened `GitMetadataCache`, or None when the cache could not be opened
+    """
+    global g_git_metadata_cache
+
+    with g_git_metadata_cache_lock:
+
+        if g_git_metadata_cache is None:
+
+            if not sqlite3:
+                log( 1, "Warning: The sqlite3 module is not available, disabling the git metadata cache." )
+                g_git_metadata_cache = False
+
+            else:
+
+                try:
+                    g_git_metadata_cache = GitMetadataCache( GIT_METADATA_CACHE_FILE )
+
+                except sqlite3.Error as error:
+                    log( 1, "Warning: Could not open the git metadata cache `%s`: %s", GIT_METADATA_CACHE_FILE, error )
+                    g_git_metadata_cache = False
+
+        return g_git_metadata_cache or None
+
+
+def get_opened_git_metadata_cache():
+    """
+        Unlike get_git_metadata_cache(), it does not create the cache file when the cache was not
+        used yet, i.e., when the `CHANNEL_GIT_METADATA_CACHE` setting disabled it.
+
+        @return the `GitMetadataCache` already opened, or None
+    """
+
+    with g_git_metadata_cache_lock:
+        return g_git_metadata_cache or None
+
+
+def record_git_references(git_metadata_cache, absolute_path, git_tags_table):
+    """
+        Forget the cached metadata of the references which do not exist anymore or which were moved,
+        and cache the tags dates and the latest tag of the current references, as the channel_manager
+        functions get_git_tag_date() and get_git_latest_tag() do.
+
+        @param git_tags_table the `GitTagsTable` with the repository current tags, or None to only
+                              forget the outdated references
+    """
+    references = get_git_cache_references( absolute_path )
+
+    if references is None:
+        return
+
+    git_metadata_cache.evict( absolute_path, references )
+
+    if not git_tags_table:
+        return
+
+    for tag_name in git_tags_table.names():
+        reference, object_id = resolve_git_reference( references, tag_name )
+        release_date = git_tags_table.get_tag_date( tag_name )
+
+        if object_id and release_date:
+            git_metadata_cache.set( absolute_path, reference, object_id, date=release_date )
+
+    if references["refs/tags"]:
+        git_metadata_cache.set( absolute_path, "refs/tags", references["refs/tags"], version=get_latest_numeric_tag( git_tags_table.names() ) )
+
+
+def get_repository_key(repository):
+    """
+        The same repository path can be written with different separators or letter case, then they
+        are all saved with the same key.
+    """
+    return os.path.normcase( os.path.normpath( repository ) )
+
+
+class GitMetadataCache(object):
+    """
+        Maps a repository reference and its object id to the date, version and release computed for
+        it, which do not change unless the reference is moved to another object.
+    """
+
+    def __init__(self, cache_file):
+        self.lock = threading.Lock()
+        self.pending_changes = 0
+
+        # The cache is shared by the channel workers threads, and all access is done with `self.lock`
+        self.connection = sqlite3.connect( cache_file, check_same_thread=False )
+        self.connection.execute( GIT_METADATA_CACHE_SCHEMA )
+        self.connection.commit()
+
+    def get(self, repository, reference, object_id):
+        """
+            @return a dictionary with the keys `date`, `version` and `release`, or None when there
+                    is nothing cached.
+        """
+        repository = get_repository_key( repository )
+
+        with self.lock:
+            row = self.connection.execute(
+                    "SELECT date, version, release FROM git_references "
+                    "WHERE repository = ? AND reference = ? AND object_id = ?",
+                    ( repository, reference, object_id ) ).fetchone()
+
+        if row is None:
+            return None
+
+        date, version, release = row
+
+        if release:
+            release = json.loads( release, object_pairs_hook=OrderedDict )
+
+        return { "date": date, "version": version, "release": release }
+
+    def set(self, repository, reference, object_id, **values):
+        """
+            Save or update the `values` cached for the reference.
+
+            @param values the keys `date`, `version` and `release`, which is any json serializable value
+        """
+
+        if "release" in values and values["release"] is not None:
+            values["release"] = json.dumps( values["release"] )
+
+        repository = get_repository_key( repository )
+
+        with self.lock:
+            self.connection.execute(
+                    "INSERT OR IGNORE INTO git_references ( repository, reference, object_id ) VALUES ( ?, ?, ? )",
+                    ( repository, reference, object_id ) )
+
+            for column in ( "date", "version", "release" ):
+
+                if column in values:
+                    self.connection.execute(
+                            "UPDATE git_references SET %s = ? "
+                            "WHERE repository = ? AND reference = ? AND object_id = ?" % column,
+                            ( values[column], repository, reference, object_id ) )
+
+            self._commit_pending_changes()
+
+    def evict(self, repository, references):
+        """
+            Remove the cached entries of the repository references which do not exist anymore, or
+            which were moved to another object.
+
+            @param references a dictionary with the current repository references and object ids
+        """
+        repository = get_repository_key( repository )
+
+        with self.lock:
+            rows = self.connection.execute(
+                    "SELECT reference, object_id FROM git_references WHERE repository = ?",
+                    ( repository, ) ).fetchall()
+
+            for reference, object_id in rows:
+
+                if references.get( reference ) != object_id:
+                    self.connection.execute(
+                            "DELETE FROM git_references WHERE repository = ? AND reference = ? AND object_id = ?",
+                            ( repository, reference, object_id ) )
+
+                    self.pending_changes += 1
+
+            self._commit_pending_changes()
+
+    def flush(self):
+
+        with self.lock:
+            self.connection.commit()
+            self.pending_changes = 0
+
+    def close(self):
+
+        with self.lock:
+            self.connection.commit()
+            self.connection.close()
+
+    def _commit_pending_changes(self):
+        self.pending_changes += 1
+
+        if self.pending_changes > MAXIMUM_PENDING_CHANGES:
+            self.connection.commit()
+            self.pending_changes = 0
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Git Object Server, keep one git process open for each repository
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import threading
+import subprocess
+
+from collections import OrderedDict
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# https://git-scm.com/docs/git-cat-file#_batch_output
+GIT_OBJECT_SERVER_COMMAND = [ "git", "cat-file", "--batch" ]
+
+# How many seconds to wait for the git process to exit after closing its input
+GIT_OBJECT_SERVER_TIMEOUT = 10
+
+
+class GitObjectServer(object):
+    """
+        Keeps one `git cat-file --batch` process open for one repository, then reading each object
+        is one line written to its input, instead of starting a new git process for each query.
+    """
+
+    def __init__(self, absolute_path):
+        self.absolute_path = absolute_path
+        self.lock = threading.Lock()
+
+        startupinfo = None
+
+        # Do not open a console window for the git process on Windows
+        if os.name == 'nt':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+        self.process = subprocess.Popen( GIT_OBJECT_SERVER_COMMAND, cwd=absolute_path, startupinfo=startupinfo,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL )
+
+    def read_object(self, revision):
+        """
+            @param revision anything accepted by git as `HEAD`, `master^{commit}` or an object id
+            @return a tuple `(object_id, type, contents)`, or None when the object does not exist
+        """
+
+        with self.lock:
+            self.process.stdin.write( revision.encode( 'utf-8' ) + b"\n" )
+            self.process.stdin.flush()
+
+            # The header is `<object_id> <type> <size>`, or `<revision> missing` when it was not found
+            header = self.process.stdout.readline().split()
+
+            if len( header ) != 3:
+
+                if not header:
+                    raise IOError( "The git object server for `%s` exited unexpectedly." % self.absolute_path )
+
+                return None
+
+            object_id, object_type, size = header
+            contents = self.process.stdout.read( int( size ) + 1 )[:-1]
+
+        return object_id.decode( 'utf-8' ), object_type, contents
+
+    def close(self):
+
+        with self.lock:
+
+            try:
+                self.process.stdin.close()
+                self.process.wait( GIT_OBJECT_SERVER_TIMEOUT )
+
+            except ( IOError, OSError, subprocess.TimeoutExpired ):
+                self.process.kill()
+                self.process.wait()
+
+            self.process.stdout.close()
+
+
+class GitObjectServersPool(object):
+    """
+        Holds the opened `GitObjectServer`, closing the least recently used one when there are
+        already `maximum_servers` opened.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.servers = OrderedDict()
+
+    def read_object(self, absolute_path, revision, maximum_servers):
+        """
+            @return the same as GitObjectServer.read_object(), or None when git could not be run
+        """
+        server = self.get_server( absolute_path, maximum_servers )
+
+        if server:
+
+            try:
+                return server.read_object( revision )
+
+            except ( IOError, OSError, ValueError ) as error:
+                log( 1, "Warning: Could not read the git object `%s` on `%s`: %s", revision, absolute_path, error )
+                self.close( absolute_path )
+
+        return None
+
+    def get_server(self, absolute_path, maximum_servers):
+        closed_servers = []
+
+        with self.lock:
+            server = self.servers.pop( absolute_path, None )
+
+            if server is None:
+
+                while self.servers and len( self.servers ) >= maximum_servers:
+                    closed_servers.append( self.servers.popitem( last=False )[1] )
+
+                try:
+                    server = GitObjectServer( absolute_path )
+
+                except ( IOError, OSError ) as error:
+                    log( 1, "Warning: Could not start the git object server on `%s`: %s", absolute_path, error )
+
+            if server:
+                self.servers[absolute_path] = server
+
+        # Closing waits for the git process to exit, then it is done without holding the pool lock
+        for closed_server in closed_servers:
+            closed_server.close()
+
+        return server
+
+    def close(self, absolute_path=None):
+        """
+            @param absolute_path the repository server to close, or None to close all servers
+        """
+
+        with self.lock:
+
+            if absolute_path is None:
+                closed_servers = list( self.servers.values() )
+                self.servers.clear()
+
+            else:
+                closed_servers = [ server for server in [ self.servers.pop( absolute_path, None ) ] if server ]
+
+        for closed_server in closed_servers:
+            closed_server.close()
+
+    def __len__(self):
+        return len( self.servers )
+
+
+# When this module is reloaded, the servers opened by its last version are closed, otherwise their
+# git processes would be left running until Sublime Text is closed
+try:
+    g_git_object_servers.close()
+
+except NameError:
+    pass
+
+g_git_object_servers = GitObjectServersPool()
+
+
+def get_git_object_servers():
+    return g_git_object_servers
+
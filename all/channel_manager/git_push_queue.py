@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Git Push Queue, push several repositories at the same time
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import re
+import threading
+import collections
+import urllib.parse
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The scp like git urls as `git@github.com:user/repository.git`
+SCP_URL_REGEX = re.compile( r'^(?:[^@/]+@)?([^:/]+):' )
+
+
+class GitPushQueue(object):
+    """
+        Run the pushes queued by put() on up to `maximum_workers` threads, but never more than
+        `maximum_host_pushes` at the same time to the same remote host. The pushes start in the same
+        order they were queued, unless their host is already busy.
+    """
+
+    def __init__(self, push_function, maximum_workers, maximum_host_pushes):
+        """
+            @param push_function   the function called with the put() arguments for each push
+            @param maximum_workers how many pushes run at the same time, values lower than 1 run
+                                   each push when it is queued
+        """
+        self.push_function = push_function
+        self.maximum_workers = maximum_workers
+        self.maximum_host_pushes = max( 1, maximum_host_pushes )
+
+        self.condition = threading.Condition()
+        self.pending_pushes = collections.deque()
+        self.host_pushes = collections.Counter()
+
+        self.workers = []
+        self.is_closed = False
+
+    def put(self, host, *arguments):
+
+        if self.maximum_workers < 1:
+            self._push( arguments )
+            return
+
+        with self.condition:
+
+            if self.is_closed:
+                raise RuntimeError( "The git push queue was already joined." )
+
+            self.pending_pushes.append( ( host, arguments ) )
+
+            # The workers are only started when there is something to push
+            if len( self.workers ) < self.maximum_workers:
+                worker = threading.Thread( target=self._run_worker )
+                worker.daemon = True
+
+                self.workers.append( worker )
+                worker.start()
+
+            self.condition.notify()
+
+    def join(self):
+        """
+            Wait for all the queued pushes to finish. No more pushes can be queued after this.
+        """
+
+        with self.condition:
+            self.is_closed = True
+            self.condition.notify_all()
+
+        for worker in self.workers:
+            worker.join()
+
+    def _run_worker(self):
+
+        while True:
+
+            with self.condition:
+                push = self._take_push()
+
+                while push is None:
+
+                    if self.is_closed and not self.pending_pushes:
+                        return
+
+                    self.condition.wait()
+                    push = self._take_push()
+
+            host, arguments = push
+
+            try:
+                self._push( arguments )
+
+            finally:
+
+                with self.condition:
+                    self.host_pushes[host] -= 1
+                    self.condition.notify_all()
+
+    def _take_push(self):
+        """
+            Must be called while holding the `condition` lock.
+
+            @return the first pending push whose host is not busy, or None when there is none
+        """
+
+        for index, ( host, arguments ) in enumerate( self.pending_pushes ):
+
+            if self.host_pushes[host] < self.maximum_host_pushes:
+                del self.pending_pushes[index]
+
+                self.host_pushes[host] += 1
+                return host, arguments
+
+        return None
+
+    def _push(self, arguments):
+
+        try:
+            self.push_function( *arguments )
+
+        except Exception as error:
+            log.exception( "Error: Could not push the arguments %s: %s", arguments, error )
+
+
+def get_url_host(url):
+    """
+        @param url a git remote url as `https://github.com/user/repository` or `git@github.com:user/repository`
+        @return the url host name, or an empty string for the local repositories
+    """
+
+    if "://" in url:
+        return urllib.parse.urlsplit( url ).hostname or ""
+
+    scp_match = SCP_URL_REGEX.match( url )
+
+    # Windows paths as `C:/repository` are not scp like urls
+    if scp_match and len( scp_match.group( 1 ) ) > 1:
+        return scp_match.group( 1 )
+
+    return ""
+
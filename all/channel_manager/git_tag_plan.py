@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Git Tag Plan, record the tags changes before applying them
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+
+from collections import OrderedDict
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from . import settings as g_settings
+
+except( ImportError, ValueError ):
+    import settings as g_settings
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The last plan created by the `git_tag_plan` command, which is applied by `git_tag_apply`
+CHANNEL_TAG_PLAN_FILE = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "all", "last_tag_plan.json" )
+
+# Increment this when the saved plans format change, to not apply the old plans
+TAG_PLAN_VERSION = 1
+
+CREATE_TAG_OPERATION  = "create"
+DELETE_TAGS_OPERATION = "delete"
+
+
+class RepositoryTagPlan(object):
+    """
+        The tags changes the `git_tag_all` command would do on one repository. They are recorded
+        instead of done, on the same order, then they can be reviewed and applied later.
+    """
+
+    def __init__(self, head=None, latest_tag=None, operations=None, pushed_refspecs=None, release=None):
+        """
+            @param head            the HEAD commit when the plan was created
+            @param latest_tag      the repository latest tag when the plan was created
+            @param operations      a list of `(operation, argument)` as `("create", "1.0.1")` or
+                                   `("delete", ["1.0.0", "v1.0.0"])`
+            @param pushed_refspecs the refspecs to push to the origin remote after the operations
+            @param release         the `releases[0]` values changed by the operations
+        """
+        self.head = head
+        self.latest_tag = latest_tag
+        self.operations = [ tuple( operation ) for operation in operations or [] ]
+        self.pushed_refspecs = list( pushed_refspecs or [] )
+        self.release = OrderedDict( release or {} )
+
+    def create_tag(self, tag):
+        self.operations.append( ( CREATE_TAG_OPERATION, tag ) )
+        return True
+
+    def delete_tags(self, tags_list):
+        self.operations.append( ( DELETE_TAGS_OPERATION, list( tags_list ) ) )
+
+    def get_head_tags(self, head_tags):
+        """
+            @param head_tags the tags pointing at HEAD before the planned operations
+            @return the tags which would be pointing at HEAD after the planned operations
+        """
+        head_tags = list( head_tags )
+
+        for operation, argument in self.operations:
+
+            if operation == CREATE_TAG_OPERATION:
+                head_tags.append( argument )
+
+            else:
+                head_tags = [ tag for tag in head_tags if tag not in argument ]
+
+        return head_tags
+
+    def get_created_tags(self):
+        return [ argument for operation, argument in self.operations if operation == CREATE_TAG_OPERATION ]
+
+    def get_deleted_tags(self):
+        return [ tag for operation, argument in self.operations if operation == DELETE_TAGS_OPERATION for tag in argument ]
+
+    def is_changed(self):
+        """
+            @return True when applying the plan runs git, otherwise only the `releases[0]` is updated
+        """
+        return bool( self.operations or self.pushed_refspecs )
+
+    def to_dict(self):
+        plan = OrderedDict()
+        plan['head'] = self.head
+        plan['latest_tag'] = self.latest_tag
+        plan['operations'] = [ list( operation ) for operation in self.operations ]
+        plan['pushed_refspecs'] = self.pushed_refspecs
+        plan['release'] = self.release
+        return plan
+
+    @classmethod
+    def from_dict(cls, plan):
+        return cls( plan.get( 'head' ), plan.get( 'latest_tag' ), plan.get( 'operations' ),
+                plan.get( 'pushed_refspecs' ), plan.get( 'release' ) )
+
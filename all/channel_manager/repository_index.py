@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Repository Index, read single packages from the repository file without parsing it
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import json
+import mmap
+import struct
+
+from collections import OrderedDict
+from collections.abc import Mapping
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from .channel_writer import get_file_digest
+    from .channel_writer import atomic_file_writer
+
+except( ImportError, ValueError ):
+    from channel_writer import get_file_digest
+    from channel_writer import atomic_file_writer
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+INDEX_FILE_EXTENSION = ".index"
+
+# Increment this when the index format change, then the old indexes are not used anymore
+REPOSITORY_INDEX_VERSION = 1
+
+# The index file starts with its magic number, its version and its json header length, followed by
+# the json header, the records table, the sorted names table, the names and the entries
+INDEX_MAGIC = b"CMRI"
+INDEX_PREFIX = struct.Struct( "<4sII" )
+
+# Each record has its name offset and length, and its entry offset and length
+INDEX_RECORD = struct.Struct( "<QIQI" )
+
+# The records indexes sorted by their names, for the binary search
+INDEX_SORTED = struct.Struct( "<I" )
+
+# The entries are written without indentation, as they are only read by the index
+COMPACT_JSON_FORMAT = { "separators": ( ",", ":" ), "ensure_ascii": False }
+
+
+def get_index_file_path(repository_file):
+    return repository_file + INDEX_FILE_EXTENSION
+
+
+def get_relative_name(file_path, directory):
+    return os.path.relpath( file_path, directory ).replace( os.sep, "/" )
+
+
+def write_repository_index(repository_file, source_files, repositories, dependencies):
+    """
+        Write the index of the `repository_file` packages and dependencies, as `repository.json.index`.
+        It is only used while the `source_files` have the same digests as when it was written.
+
+        @param source_files a list with the `repository_file` and the files it includes
+        @param repositories a list with the packages entries
+        @param dependencies a list with the dependencies entries
+    """
+    index_path = get_index_file_path( repository_file )
+    index_directory = os.path.dirname( index_path )
+
+    # The same names order as the dictionary returned by `load_repository_file()`
+    entries = OrderedDict()
+
+    for entry in repositories:
+        entries[entry['name']] = entry
+
+    packages_count = len( entries )
+
+    for entry in dependencies:
+        entries[entry['name']] = entry
+
+    names = [ name.encode( 'utf-8' ) for name in entries ]
+    encoded_entries = [ json.dumps( entry, **COMPACT_JSON_FORMAT ).encode( 'utf-8' ) for entry in entries.values() ]
+
+    header = OrderedDict()
+    header['files'] = [ [ get_relative_name( file_path, index_directory ), get_file_digest( file_path ) ] for file_path in source_files ]
+    header['count'] = len( names )
+    header['packages_count'] = packages_count
+
+    encoded_header = json.dumps( header ).encode( 'utf-8' )
+
+    records_offset = INDEX_PREFIX.size + len( encoded_header )
+    sorted_offset  = records_offset + INDEX_RECORD.size * len( names )
+    names_offset   = sorted_offset + INDEX_SORTED.size * len( names )
+    entries_offset = names_offset + sum( len( name ) for name in names )
+
+    with atomic_file_writer( index_path, 'wb' ) as output_file:
+        output_file.write( INDEX_PREFIX.pack( INDEX_MAGIC, REPOSITORY_INDEX_VERSION, len( encoded_header ) ) )
+        output_file.write( encoded_header )
+
+        for name, encoded_entry in zip( names, encoded_entries ):
+            output_file.write( INDEX_RECORD.pack( names_offset, len( name ), entries_offset, len( encoded_entry ) ) )
+
+            names_offset += len( name )
+            entries_offset += len( encoded_entry )
+
+        for index in sorted( range( len( names ) ), key=lambda index: names[index] ):
+            output_file.write( INDEX_SORTED.pack( index ) )
+
+        for name in names:
+            output_file.write( name )
+
+        for encoded_entry in encoded_entries:
+            output_file.write( encoded_entry )
+
+    log( 1, "Wrote the index with %d packages and %d dependencies: %s", packages_count, len( names ) - packages_count, index_path )
+    return index_path
+
+
+class RepositoryIndex(Mapping):
+    """
+        A read only dictionary with the same names and entries as the one returned by the function
+        `load_repository_file()`, which is memory mapped from the index file. The names are found
+        by a binary search, and only the entries which are used are parsed.
+
+        The parsed entries are kept, then their changes are seen by the next lookups, as on the
+        dictionary loaded from the repository file.
+    """
+
+    def __init__(self, index_path, header, index_file, index_map, load_dependencies=True):
+        self.index_path = index_path
+        self.index_file = index_file
+        self.index_map  = index_map
+
+        self.count = header['packages_count'] if not load_dependencies else header['count']
+        self.packages_count = header['packages_count']
+
+        self.records_offset = INDEX_PREFIX.size + header['length']
+        self.sorted_offset  = self.records_offset + INDEX_RECORD.size * header['count']
+        self.sorted_count   = header['count']
+
+        self.entries = {}
+
+    @staticmethod
+    def open(repository_file, load_dependencies=True):
+        """
+            @return the `RepositoryIndex` of the `repository_file`, or None when it does not exist,
+                    it is not valid or its source files changed since it was written
+        """
+        index_path = get_index_file_path( repository_file )
+
+        try:
+            index_file = open( index_path, 'rb' )
+
+        except ( IOError, OSError ):
+            return None
+
+        try:
+            index_map = mmap.mmap( index_file.fileno(), 0, access=mmap.ACCESS_READ )
+
+        except ( ValueError, OSError ):
+            index_file.close()
+            return None
+
+        header = read_index_header( index_path, index_map )
+
+        if header is None:
+            index_map.close()
+            index_file.close()
+            return None
+
+        return RepositoryIndex( index_path, header, index_file, index_map, load_dependencies )
+
+    def close(self):
+
+        if self.index_map is not None:
+            self.index_map.close()
+            self.index_file.close()
+            self.index_map = None
+
+    def __del__(self):
+        self.close()
+
+    def _read_record(self, index):
+        return INDEX_RECORD.unpack_from( self.index_map, self.records_offset + INDEX_RECORD.size * index )
+
+    def _read_name(self, index):
+        name_offset, name_length, _, _ = self._read_record( index )
+        return self.index_map[name_offset:name_offset + name_length]
+
+    def _find(self, name):
+        """
+            @return the record index of the `name`, or None when it is not on the index
+        """
+        encoded_name = name.encode( 'utf-8' )
+        low, high = 0, self.sorted_count
+
+        while low < high:
+            middle = ( low + high ) // 2
+            index = INDEX_SORTED.unpack_from( self.index_map, self.sorted_offset + INDEX_SORTED.size * middle )[0]
+            middle_name = self._read_name( index )
+
+            if middle_name < encoded_name:
+                low = middle + 1
+
+            elif middle_name > encoded_name:
+                high = middle
+
+            # The dependencies are after the packages, and they are not on the index without them
+            elif index < self.count:
+                return index
+
+            else:
+                return None
+
+        return None
+
+    def is_dependency(self, name):
+        """
+            @return True when the `name` is a dependency, without parsing its entry
+        """
+        index = self._find( name )
+
+        if index is None:
+            raise KeyError( name )
+
+        return index >= self.packages_count
+
+    def __getitem__(self, name):
+        entry = self.entries.get( name )
+
+        if entry is not None:
+            return entry
+
+        if not isinstance( name, str ):
+            raise KeyError( name )
+
+        index = self._find( name )
+
+        if index is None:
+            raise KeyError( name )
+
+        _, _, entry_offset, entry_length = self._read_record( index )
+        entry = json.loads( self.index_map[entry_offset:entry_offset + entry_length].decode( 'utf-8' ), object_pairs_hook=OrderedDict )
+
+        self.entries[name] = entry
+        return entry
+
+    def __contains__(self, name):
+        return name in self.entries or isinstance( name, str ) and self._find( name ) is not None
+
+    def __iter__(self):
+
+        for index in range( self.count ):
+            yield self._read_name( index ).decode( 'utf-8' )
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return "RepositoryIndex(%r, %d entries)" % ( self.index_path, self.count )
+
+
+def read_index_header(index_path, index_map):
+    """
+        @return the index header dictionary, or None when the index is not valid anymore
+    """
+
+    try:
+        magic, version, header_length = INDEX_PREFIX.unpack_from( index_map, 0 )
+
+        if magic != INDEX_MAGIC or version != REPOSITORY_INDEX_VERSION:
+            return None
+
+        header = json.loads( index_map[INDEX_PREFIX.size:INDEX_PREFIX.size + header_length].decode( 'utf-8' ) )
+        header['length'] = header_length
+
+    except ( struct.error, ValueError ):
+        return None
+
+    index_directory = os.path.dirname( index_path )
+
+    for file_name, digest in header['files']:
+        file_path = os.path.join( index_directory, os.path.normpath( file_name ) )
+
+        if digest is None or get_file_digest( file_path ) != digest:
+            log( 1, "The repository index is stale, because the file changed: %s", file_path )
+            return None
+
+    return header
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Repository Shards, split the repository file on several included files
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import os
+import re
+
+from collections import OrderedDict
+
+
+# Relative imports in Python 3
+# https://stackoverflow.com/questions/16981921/relative-imports-in-python-3
+try:
+    from .channel_writer import write_json_file
+    from .channel_writer import get_digest_file_path
+
+except( ImportError, ValueError ):
+    from channel_writer import write_json_file
+    from channel_writer import get_digest_file_path
+
+
+from debug_tools import getLogger
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The shards files names only have these characters, the others are replaced by `_`
+SHARD_NAME_REGEX = re.compile( r'[^a-z0-9]' )
+
+# The shards larger than the size budget are split by one more character of their names prefix,
+# until their names prefixes have this length
+MAXIMUM_PREFIX_LENGTH = 8
+
+
+def get_shard_name(package_name, prefix_length):
+    return SHARD_NAME_REGEX.sub( "_", package_name[:prefix_length].lower() )
+
+
+def split_shards(names, sizes, maximum_size, prefix_length=1):
+    """
+        Group the `names` by their first `prefix_length` characters, and split again the groups
+        larger than `maximum_size` by one more character. The shards boundaries only depend on the
+        names, then adding or removing one package only changes the shard where it is.
+
+        @param sizes        the encoded size of each name entry
+        @param maximum_size the shards size budget, or 0 to only group them by their first character
+        @return an OrderedDict with the indexes of the `names` on each shard, sorted by shard name
+    """
+    shards = OrderedDict()
+
+    for index, name in enumerate( names ):
+        shards.setdefault( get_shard_name( name, prefix_length ), [] ).append( index )
+
+    split_shards_list = []
+
+    for shard_name, indexes in shards.items():
+
+        if maximum_size > 0 and prefix_length < MAXIMUM_PREFIX_LENGTH and len( indexes ) > 1 \
+                and sum( sizes[index] for index in indexes ) > maximum_size:
+
+            sub_shards = split_shards( [ names[index] for index in indexes ], [ sizes[index] for index in indexes ],
+                    maximum_size, prefix_length + 1 )
+
+            for sub_shard_name, sub_indexes in sub_shards.items():
+                split_shards_list.append( ( sub_shard_name, [ indexes[index] for index in sub_indexes ] ) )
+
+        else:
+            split_shards_list.append( ( shard_name, indexes ) )
+
+    return OrderedDict( sorted( split_shards_list ) )
+
+
+def write_sharded_repository_file(file_path, repositories, dependencies, maximum_size):
+    """
+        Write the `file_path` with only the `includes` of its shards, which are written on the
+        directory with the same name as `file_path`, without its extension. Only the shards whose
+        contents changed are rewritten, and the shards which are not included anymore are removed.
+
+        @param repositories an `EncodedList` with the packages entries
+        @param dependencies an `EncodedList` with the dependencies entries
+        @return a list with the included shards files paths
+    """
+    shards_directory = os.path.splitext( file_path )[0]
+    shards_directory_name = os.path.basename( shards_directory )
+
+    # The dependencies indexes are after the packages ones
+    packages_count = len( repositories )
+
+    names = [ entry['name'] for entry in repositories.entries + dependencies.entries ]
+    sizes = [ len( fragment ) for fragment in repositories.fragments + dependencies.fragments ]
+
+    if not os.path.isdir( shards_directory ):
+        os.makedirs( shards_directory )
+
+    shards_paths = []
+    includes = []
+
+    for shard_name, indexes in split_shards( names, sizes, maximum_size ).items():
+        shard_file = OrderedDict()
+        shard_file['schema_version'] = "3.0.0"
+
+        shard_file['packages']     = repositories.subset( [ index for index in indexes if index < packages_count ] )
+        shard_file['dependencies'] = dependencies.subset( [ index - packages_count for index in indexes if index >= packages_count ] )
+
+        shard_path = os.path.join( shards_directory, shard_name + ".json" )
+        write_json_file( shard_path, shard_file )
+
+        shards_paths.append( shard_path )
+        includes.append( "./%s/%s.json" % ( shards_directory_name, shard_name ) )
+
+    remove_stale_shards( shards_directory, shards_paths )
+
+    repository_file = OrderedDict()
+    repository_file['schema_version'] = "3.0.0"
+
+    repository_file['packages']     = []
+    repository_file['dependencies'] = []
+    repository_file['includes']     = includes
+
+    write_json_file( file_path, repository_file )
+    log( 1, "Wrote %d packages and %d dependencies on %d shards.", len( repositories ), len( dependencies ), len( includes ) )
+
+    return shards_paths
+
+
+def remove_stale_shards(shards_directory, shards_paths):
+    shards_paths = set( shards_paths )
+
+    for file_name in os.listdir( shards_directory ):
+        shard_path = os.path.join( shards_directory, file_name )
+
+        if file_name.endswith( ".json" ) and shard_path not in shards_paths:
+            log( 1, "Removing the stale shard file: %s", shard_path )
+            os.remove( shard_path )
+
+            if os.path.exists( get_digest_file_path( shard_path ) ):
+                os.remove( get_digest_file_path( shard_path ) )
@@ -90,6 +90,20 @@ from debug_tools.estimated_time_left import sequence_timer
 from debug_tools.estimated_time_left import progress_info
 
 
+# They require the `debug_tools` module, then they can only be imported after the `assert_path()` calls
+try:
+    from .git_metadata import read_git_tags_table
+    from .git_metadata_cache import get_git_metadata_cache
+    from .git_metadata_cache import get_opened_git_metadata_cache
+    from .git_metadata_cache import record_git_references
+
+except( ImportError, ValueError ):
+    from git_metadata import read_git_tags_table
+    from git_metadata_cache import get_git_metadata_cache
+    from git_metadata_cache import get_opened_git_metadata_cache
+    from git_metadata_cache import record_git_references
+
+
 # When there is an ImportError, means that Package Control is installed instead of PackagesManager.
 # Which means we cannot do nothing as this is only compatible with PackagesManager.
 try:
@@ -141,6 +155,7 @@ FIND_FORKS_PATH      = os.path.join( g_settings.PACKAGE_ROOT_DIRECTORY, "find_fo
 # How many errors are acceptable when the GitHub API request fails
 MAXIMUM_REQUEST_ERRORS = 1
 g_is_already_running   = False
+g_channelSettings      = {}
 command_line_interface = cmd.Cli( None, False )
 
 
@@ -157,9 +172,16 @@ log = getLogger( 127, __name__ )
 # log( 1, "PACKAGE_ROOT_DIRECTORY: " + g_settings.PACKAGE_ROOT_DIRECTORY )
 
 
-def main(command=None):
+def main(command=None, channel_settings=None):
+    """
+        @param channel_settings the channel settings, as the `CHANNEL_GIT_METADATA_CACHE`, or None
+                                to use their default values
+    """
     log( 1, "Entering on main(1) " + str( command ) )
     global CHANNEL_ROOT_DIRECTORY
+    global g_channelSettings
+
+    g_channelSettings = channel_settings or {}
 
     maximum_repositories   = 0
     synced_repositories    = False
@@ -345,6 +367,12 @@ class RunBackstrokeThread(threading.Thread):
         log.newline()
         log( 1, "Finished RunBackstrokeThread::run()" )
 
+        # It is only opened when some repository was updated and the cache is enabled
+        git_metadata_cache = get_opened_git_metadata_cache()
+
+        if git_metadata_cache:
+            git_metadata_cache.flush()
+
     def run_githubpullrequests(self):
         token_file = join_path( CHANNEL_ROOT_DIRECTORY, 'Local', 'GITHUBPULLREQUESTS_TOKEN' )
         gitmodules_file = join_path( CHANNEL_ROOT_DIRECTORY, '.gitmodules' )
@@ -539,6 +567,7 @@ class RunBackstrokeThread(threading.Thread):
                 forkpath = get_section_option( section, "path", generalSettingsConfigs )
 
                 run( "git pull --rebase", base_root_directory, forkpath )
+                update_git_metadata_cache( base_root_directory, forkpath )
                 self.recursiveily_process_submodules( base_root_directory, command, forkpath )
 
             elif command == "fetch_origins":
@@ -546,6 +575,7 @@ class RunBackstrokeThread(threading.Thread):
                 forkpath = get_section_option( section, "path", generalSettingsConfigs )
 
                 run( "git fetch origin", base_root_directory, forkpath )
+                update_git_metadata_cache( base_root_directory, forkpath )
                 self.recursiveily_process_submodules( base_root_directory, command, forkpath )
 
             else:
@@ -581,6 +611,23 @@ class RunBackstrokeThread(threading.Thread):
             self.run_general_command( base_root_directory, nested_submodules_file, command )
 
 
+def update_git_metadata_cache(*args):
+    """
+        The `git pull` and `git fetch` commands can create, delete or move the repository tags, then
+        update the git metadata cache shared with the channel_manager, see the function
+        record_git_references(). The `CHANNEL_GIT_METADATA_CACHE` setting allows to disable it.
+    """
+
+    if not g_channelSettings.get( 'CHANNEL_GIT_METADATA_CACHE', True ):
+        return
+
+    git_metadata_cache = get_git_metadata_cache()
+
+    if git_metadata_cache:
+        absolute_path = os.path.join( *args )
+        record_git_references( git_metadata_cache, absolute_path, read_git_tags_table( absolute_path, command_line_interface ) )
+
+
 def run(command, *args):
     command = shlex.split( command )
     basepath = os.path.join( *args )
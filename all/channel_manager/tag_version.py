@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Tag Version, parse the git tags semantic versions only once
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import re
+import functools
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The first of these found on the tag is its version, the missing numbers are `0`
+SEMANTIC_VERSION_REGEXES = [
+    re.compile( r"(\d+)\.(\d+)\.(\d+)" ),
+    re.compile( r"(\d+)\.(\d+)" ),
+    re.compile( r"(\d+)" ),
+]
+
+# The tags on the form `0.0anything` (number.number)
+NUMERIC_TAG_REGEX = re.compile( r"^(\d+)\.(\d+)(.+)?$" )
+
+# How many distinct tags names are kept parsed, as `1.0.0`, which are shared by most repositories
+PARSED_TAGS_CACHE_SIZE = 4096
+
+
+class ParsedTag(object):
+    """
+        A git tag as `v1.6a`, split on its `prefix` as `v`, its version `numbers` as `("1", "6", "0")`
+        and its `suffix` as `a`. The numbers are kept as they were written on the tag, then the ones
+        not incremented keep their leading zeros.
+
+        The parsed tags are shared by all repositories with the same tag name, then they must not be
+        changed.
+    """
+    __slots__ = ( 'text', 'prefix', 'numbers', 'suffix', 'matched', 'is_numeric' )
+
+    def __init__(self, text, prefix, numbers, suffix, matched, is_numeric):
+        self.text = text
+        self.prefix = prefix
+        self.numbers = numbers
+        self.suffix = suffix
+        self.matched = matched
+        self.is_numeric = is_numeric
+
+    @staticmethod
+    def parse(text):
+        return parse_tag( text )
+
+    @property
+    def semantic_version(self):
+        """
+            @return the tag version on the format `0.0.0`, or None when the tag has no numbers
+        """
+
+        if self.numbers is None:
+            return None
+
+        return ".".join( self.numbers )
+
+    def increment(self, severity_level):
+        """
+            @param severity_level 3 - Increments Patch, 2 - Minor, 1 - Major
+            @return the incremented version on the format `0.0.0`
+        """
+        numbers = []
+
+        for group, number in enumerate( self.numbers, 1 ):
+
+            if severity_level == group:
+                numbers.append( str( int( number ) + 1 ) )
+
+            elif severity_level < group:
+                numbers.append( "0" )
+
+            else:
+                numbers.append( number )
+
+        return ".".join( numbers )
+
+    def __repr__(self):
+        return "ParsedTag(%r, %r)" % ( self.text, self.numbers )
+
+
+@functools.lru_cache( maxsize=PARSED_TAGS_CACHE_SIZE )
+def parse_tag(text):
+    is_numeric = NUMERIC_TAG_REGEX.search( text ) is not None
+
+    for expression in SEMANTIC_VERSION_REGEXES:
+        matches = expression.search( text )
+
+        if matches:
+            numbers = matches.groups() + ( "0", ) * ( 3 - len( matches.groups() ) )
+            return ParsedTag( text, text[:matches.start()], numbers, text[matches.end():], matches.group( 0 ), is_numeric )
+
+    return ParsedTag( text, text, None, "", None, is_numeric )
+
+
+def get_latest_numeric_tag(tags_names):
+    """
+        @param tags_names a list of tags names sorted by version, as `git tag --sort=version:refname`
+        @return the last tag on the form `0.0anything` (number.number), otherwise the last tag
+    """
+
+    for tag_name in reversed( tags_names ):
+
+        if parse_tag( tag_name ).is_numeric:
+            return tag_name
+
+    return tags_names[-1]
+
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# These lines allow to use UTF-8 encoding and run this file with `./update.py`, instead of `python update.py`
+# https://stackoverflow.com/questions/7670303/purpose-of-usr-bin-python3
+# https://stackoverflow.com/questions/728891/correct-way-to-define-python-source-code-encoding
+#
+#
+
+#
+# Licensing
+#
+# Channel Manager Version Range, parse the Sublime Text builds ranges of the releases
+# Copyright (C) 2017 Evandro Coan <https://github.com/evandrocoan>
+#
+#  This program is free software; you can redistribute it and/or modify it
+#  under the terms of the GNU General Public License as published by the
+#  Free Software Foundation; either version 3 of the License, or ( at
+#  your option ) any later version.
+#
+#  This program is distributed in the hope that it will be useful, but
+#  WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+
+import re
+import functools
+
+from debug_tools import getLogger
+
+
+# Debugger settings: 0 - disabled, 127 - enabled
+log = getLogger( 127, __name__ )
+
+
+# The release `sublime_text` formats, as `>3114`, `>=3126`, `<3143`, `<=3143` and `3092 - 3143`
+VERSION_RANGE_REGEX = re.compile( r'(?:(>=|<=|>|<)(\d+)|(\d+)\s*-\s*(\d+))$' )
+
+# How many distinct `sublime_text` strings are kept parsed
+VERSION_RANGES_CACHE_SIZE = 1024
+
+
+class VersionRange(object):
+    """
+        The Sublime Text builds allowed by a release `sublime_text` value. The ranges are shared by
+        all the releases with the same value, then they must not be changed.
+    """
+    __slots__ = ( 'text', 'min_build', 'max_build' )
+
+    def __init__(self, text, min_build, max_build):
+        self.text = text
+        self.min_build = min_build
+        self.max_build = max_build
+
+    @staticmethod
+    def parse(text):
+        """
+            @return the VersionRange for `text`, or None when it is not a valid `sublime_text` value
+        """
+        return parse_version_range( text )
+
+    def contains(self, build):
+        return self.min_build <= build <= self.max_build
+
+    def __contains__(self, build):
+        return self.contains( build )
+
+    def __repr__(self):
+        return "VersionRange(%r, %s, %s)" % ( self.text, self.min_build, self.max_build )
+
+
+@functools.lru_cache( maxsize=VERSION_RANGES_CACHE_SIZE )
+def parse_version_range(text):
+
+    if text == '*':
+        return VersionRange( text, float( "-inf" ), float( "inf" ) )
+
+    range_match = VERSION_RANGE_REGEX.match( text )
+
+    if not range_match:
+        return None
+
+    operator, build, first_build, last_build = range_match.groups()
+
+    if operator is None:
+        return VersionRange( text, int( first_build ), int( last_build ) )
+
+    build = int( build )
+
+    if operator == '>':
+        return VersionRange( text, build + 1, float( "inf" ) )
+
+    if operator == '>=':
+        return VersionRange( text, build, float( "inf" ) )
+
+    if operator == '<':
+        return VersionRange( text, float( "-inf" ), build - 1 )
+
+    return VersionRange( text, float( "-inf" ), build )
+